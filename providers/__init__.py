@@ -1,7 +1,6 @@
 """Model provider abstractions for supporting OpenAI-compatible AI providers."""
 
 from .base import ModelCapabilities, ModelProvider, ModelResponse
-from .openai_provider import OpenAIModelProvider
 from .registry import ModelProviderRegistry
 
 __all__ = [
@@ -11,3 +10,13 @@ __all__ = [
     "ModelProviderRegistry",
     "OpenAIModelProvider",
 ]
+
+
+def __getattr__(name):
+    """Import OpenAIModelProvider on first access so the OpenAI SDK loads lazily."""
+    if name == "OpenAIModelProvider":
+        from .openai_provider import OpenAIModelProvider
+
+        globals()[name] = OpenAIModelProvider
+        return OpenAIModelProvider
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
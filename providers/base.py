@@ -4,6 +4,7 @@ import logging
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import cached_property
 from typing import Any, Optional
 
 logger = logging.getLogger(__name__)
@@ -14,6 +15,11 @@ class ProviderType(Enum):
 
     OPENAI = "openai"
 
+    # Members are singletons and compare by identity, so the C-level identity
+    # hash is equivalent to Enum's Python-level hash(self._name_) but cheaper
+    # for the registry dicts keyed by provider type.
+    __hash__ = object.__hash__
+
 
 class TemperatureConstraint(ABC):
     """Abstract base class for temperature constraints."""
@@ -139,6 +145,7 @@ class ModelCapabilities:
     # Additional fields for comprehensive model information
     description: str = ""  # Human-readable description of the model
     aliases: list[str] = field(default_factory=list)  # Alternative names/shortcuts for the model
+    capability_tag: Optional[str] = None  # Headline capability, e.g. "ultra_fast" (see tools/listmodels.py)
 
     # JSON mode support (for providers that support structured output)
     supports_json_mode: bool = False
@@ -167,6 +174,15 @@ class ModelCapabilities:
             return (min(values), max(values))
         return (0.0, 2.0)  # Fallback
 
+    @cached_property
+    def context_str(self) -> str:
+        """Context window formatted for display, e.g. "200K context" or "1M context"."""
+        if self.context_window >= 1_000_000:
+            return f"{self.context_window // 1_000_000}M context"
+        if self.context_window >= 1_000:
+            return f"{self.context_window // 1_000}K context"
+        return f"{self.context_window} context" if self.context_window > 0 else "unknown context"
+
 
 @dataclass
 class ModelResponse:
@@ -195,6 +211,7 @@ class ModelProvider(ABC):
         """Initialize the provider with API key and optional configuration."""
         self.api_key = api_key
         self.config = kwargs
+        self._resolve_cache: dict[str, str] = {}
 
     @abstractmethod
     def get_capabilities(self, model_name: str) -> ModelCapabilities:
@@ -341,6 +358,26 @@ class ModelProvider(ABC):
         Returns:
             Resolved model name
         """
+        # Model configurations don't change for the provider's lifetime, so each known
+        # name only needs to be scanned against the alias table once. Entries are keyed
+        # case-insensitively and unknown names are never stored, so the cache is bounded
+        # by the alias table no matter what names callers send.
+        key = model_name.lower()
+        resolved = self._resolve_cache.get(key)
+        if resolved is None:
+            resolved = self._lookup_model_name(model_name)
+            if resolved is None:
+                # If not found, return as-is
+                return model_name
+            self._resolve_cache[key] = resolved
+        return resolved
+
+    def _lookup_model_name(self, model_name: str) -> Optional[str]:
+        """Resolve model shorthand to full name without consulting the cache.
+
+        Returns:
+            The base model name, or None if the name is not a known model or alias
+        """
         # Get model configurations from the hook method
         model_configs = self.get_model_configurations()
 
@@ -362,8 +399,7 @@ class ModelProvider(ABC):
             if any(alias.lower() == model_name_lower for alias in aliases):
                 return base_model
 
-        # If not found, return as-is
-        return model_name
+        return None
 
     def list_models(self, respect_restrictions: bool = True) -> list[str]:
         """Return a list of model names supported by this provider.
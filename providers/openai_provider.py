@@ -6,6 +6,7 @@ import json
 import logging
 import os
 import time
+from functools import cached_property
 from typing import Optional
 from urllib.parse import urlparse
 
@@ -22,9 +23,6 @@ from .base import (
 logger = logging.getLogger(__name__)
 
 
-
-
-
 class OpenAIModelProvider(ModelProvider):
     """OpenAI-compatible API provider supporting both official OpenAI models and custom models.
 
@@ -56,6 +54,7 @@ class OpenAIModelProvider(ModelProvider):
             temperature_constraint=create_temperature_constraint("fixed"),
             description="Strong reasoning (200K context) - Logical problems, code generation, systematic analysis",
             aliases=[],
+            capability_tag="strong_reasoning",
         ),
         "o3-pro": ModelCapabilities(
             provider=ProviderType.OPENAI,
@@ -74,6 +73,7 @@ class OpenAIModelProvider(ModelProvider):
             temperature_constraint=create_temperature_constraint("fixed"),
             description="Professional-grade reasoning (200K context) - EXTREMELY EXPENSIVE: Only for the most complex problems requiring universe-scale complexity analysis OR when the user explicitly asks for this model. Use sparingly for critical architectural decisions or exceptionally complex debugging that other models cannot handle.",
             aliases=["o3-pro"],
+            capability_tag="very_expensive",
         ),
         "gemini-2.5-pro": ModelCapabilities(
             provider=ProviderType.OPENAI,
@@ -93,6 +93,7 @@ class OpenAIModelProvider(ModelProvider):
             max_thinking_tokens=32768,  # Max thinking tokens for Pro model
             description="Deep reasoning + thinking mode (1M context) - Complex problems, architecture, deep analysis",
             aliases=["pro", "gemini pro", "gemini-pro"],
+            capability_tag="deep_reasoning",
         ),
         "gemini-2.5-flash": ModelCapabilities(
             provider=ProviderType.OPENAI,
@@ -112,14 +113,13 @@ class OpenAIModelProvider(ModelProvider):
             max_thinking_tokens=24576,  # Flash 2.5 thinking budget limit
             description="Ultra-fast (1M context) - Quick analysis, simple queries, rapid iterations",
             aliases=["flash", "flash2.5"],
+            capability_tag="ultra_fast",
         ),
     }
 
     # All supported models (no longer needs dynamic loading)
     SUPPORTED_MODELS = _BASE_MODELS
 
-
-
     def __init__(self, api_key: str, base_url: str = None, **kwargs):
         """Initialize OpenAI provider with API key and optional base URL.
 
@@ -414,31 +414,30 @@ class OpenAIModelProvider(ModelProvider):
         if system_prompt:
             messages.append({"role": "system", "content": system_prompt})
 
-        # Prepare user message with text and potentially images
-        user_content = []
-        user_content.append({"type": "text", "text": prompt})
-
-        # Add images if provided and model supports vision
-        if images and self._supports_vision(resolved_model_name):
-            for image_path in images:
-                try:
-                    image_content = self._process_image(image_path)
-                    if image_content:
-                        user_content.append(image_content)
-                except Exception as e:
-                    logging.warning(f"Failed to process image {image_path}: {e}")
-                    # Continue with other images and text
-                    continue
-        elif images and not self._supports_vision(resolved_model_name):
-            logging.warning(f"Model {resolved_model_name} does not support images, ignoring {len(images)} image(s)")
+        # Collect image parts if provided and model supports vision; text-only requests
+        # (the common case) never build the content array
+        image_parts = []
+        if images:
+            if self._supports_vision(resolved_model_name):
+                for image_path in images:
+                    try:
+                        image_content = self._process_image(image_path)
+                        if image_content:
+                            image_parts.append(image_content)
+                    except Exception as e:
+                        logging.warning(f"Failed to process image {image_path}: {e}")
+                        # Continue with other images and text
+                        continue
+            else:
+                logging.warning(f"Model {resolved_model_name} does not support images, ignoring {len(images)} image(s)")
 
         # Add user message
-        if len(user_content) == 1:
+        if not image_parts:
             # Only text content, use simple string format for compatibility
             messages.append({"role": "user", "content": prompt})
         else:
             # Text + images, use content array format
-            messages.append({"role": "user", "content": user_content})
+            messages.append({"role": "user", "content": [{"type": "text", "text": prompt}, *image_parts]})
 
         # Prepare completion parameters
         completion_params = {
@@ -508,12 +507,12 @@ class OpenAIModelProvider(ModelProvider):
                 return ModelResponse(
                     content=content,
                     usage=usage,
-                    model_name=model_name,
+                    model_name=resolved_model_name,  # Same name the responses endpoint path reports
                     friendly_name=self.FRIENDLY_NAME,
                     provider=self.get_provider_type(),
                     metadata={
                         "finish_reason": choice.finish_reason,
-                        "model": getattr(response, "model", model_name),  # Actual model used
+                        "model": getattr(response, "model", resolved_model_name),  # Actual model used
                         "id": getattr(response, "id", ""),
                         "created": getattr(response, "created", 0),
                     },
@@ -925,8 +924,21 @@ class OpenAIModelProvider(ModelProvider):
         """Get the provider type."""
         return ProviderType.OPENAI
 
+    @cached_property
+    def _valid_names(self) -> frozenset[str]:
+        """Lowercased model names and aliases, for rejecting unknown names without resolving them."""
+        names = set()
+        for model_name, capabilities in self.SUPPORTED_MODELS.items():
+            names.add(model_name.lower())
+            if isinstance(capabilities, ModelCapabilities):
+                names.update(alias.lower() for alias in capabilities.aliases)
+        return frozenset(names)
+
     def validate_model_name(self, model_name: str) -> bool:
         """Validate if the model name is supported and allowed."""
+        if model_name.lower() not in self._valid_names:
+            return False
+
         resolved_name = self._resolve_model_name(model_name)
 
         # First check if model is supported
@@ -943,8 +955,6 @@ class OpenAIModelProvider(ModelProvider):
 
         return True
 
-
-
     def supports_thinking_mode(self, model_name: str) -> bool:
         """Check if the model supports extended thinking mode."""
         # Currently no OpenAI models support extended thinking
@@ -1,30 +1,81 @@
 """Model provider registry for managing available providers."""
 
+import itertools
 import logging
 import os
+import sys
+import threading
+from collections.abc import Mapping
 from typing import TYPE_CHECKING, Optional
 
-from .base import ModelProvider, ProviderType
+from .base import ModelCapabilities, ModelProvider, ProviderType
 
 if TYPE_CHECKING:
     from tools.models import ToolModelCategory
 
+# Provider lookup order for get_provider_for_model()
+PROVIDER_PRIORITY_ORDER = (ProviderType.OPENAI,)  # OpenAI compatible API access (includes custom endpoints)
+
+
+def _interned(*names: str) -> tuple[str, ...]:
+    """Return model names as a tuple of interned strings.
+
+    Provider model listings are interned too (see _list_provider_models), so
+    set and dict lookups between them can match on identity.
+    """
+    return tuple(sys.intern(name) for name in names)
+
+
+# Fallback selection rows: (preferred models in order, default if none available).
+# Keyed by ToolModelCategory in ModelProviderRegistry._get_fallback_table().
+_EXTENDED_REASONING_FALLBACK = (_interned("o3", "o3-pro", "deepseek-r1"), "gpt-4")
+_FAST_RESPONSE_FALLBACK = (_interned("o4-mini", "o3-mini", "flash", "gpt-4o-mini"), "gpt-4o-mini")
+# Covers BALANCED and calls without a category
+_DEFAULT_FALLBACK = (_interned("o4-mini", "o3-mini", "pro", "gpt-4o"), "gpt-4o")
+
+# Models known for deep reasoning, in order of preference for _find_extended_thinking_model()
+_PREFERRED_THINKING = _interned(
+    "deepseek-r1",
+    "o3",
+    "o3-pro",
+    "gpt-4o",
+    "claude-3-opus",
+    "claude-3-sonnet",
+    "gemini-2.5-pro",
+    "llama-3.1-70b",
+    "mixtral-8x7b",
+)
+
 
 class ModelProviderRegistry:
     """Registry for managing model providers."""
 
-    _instance = None
-
-    def __new__(cls):
-        """Singleton pattern for registry."""
-        if cls._instance is None:
-            logging.debug("REGISTRY: Creating new registry instance")
-            cls._instance = super().__new__(cls)
-            # Initialize instance dictionaries on first creation
-            cls._instance._providers = {}
-            cls._instance._initialized_providers = {}
-            logging.debug(f"REGISTRY: Created instance {cls._instance}")
-        return cls._instance
+    # Registry state lives on the class so classmethods can use it without a singleton lookup
+    _providers: dict[ProviderType, type[ModelProvider]] = {}
+    _initialized_providers: dict[ProviderType, ModelProvider] = {}
+    # Guards provider construction so concurrent callers don't build duplicate clients
+    _init_lock = threading.Lock()
+
+    # Model listings are cached until providers change (see _invalidate_model_caches)
+    # Keyed by respect_restrictions: (model -> provider, provider -> models), stored together
+    _available_models_cache: dict[bool, tuple[dict[str, ProviderType], dict[ProviderType, list[str]]]] = {}
+    _model_list_cache: dict[tuple[ProviderType, bool], list[str]] = {}
+    _cached_restriction_service = None
+    _cached_restriction_getter = None
+    # utils.model_restrictions, imported on first use (see _validate_model_caches)
+    _restrictions_module = None
+    # Only successful lookups are cached, so unknown names sent by clients can't grow it
+    _model_provider_cache: dict[str, ProviderType] = {}
+    _capabilities_cache: dict[str, tuple[ModelProvider, ModelCapabilities]] = {}
+    # Bumped whenever the caches above are invalidated (see configuration_version)
+    _configuration_version = 0
+    # ToolModelCategory -> fallback row, built on first use (see _get_fallback_table)
+    _fallback_table: Optional[dict[Optional["ToolModelCategory"], tuple[tuple[str, ...], str]]] = None
+
+    # Environment variable holding the API key for each provider type
+    _API_KEY_ENV: dict[ProviderType, str] = {
+        ProviderType.OPENAI: "OPENAI_API_KEY",
+    }
 
     @classmethod
     def register_provider(cls, provider_type: ProviderType, provider_class: type[ModelProvider]) -> None:
@@ -34,8 +85,14 @@ class ModelProviderRegistry:
             provider_type: Type of the provider (e.g., ProviderType.OPENAI)
             provider_class: Class that implements ModelProvider interface
         """
-        instance = cls()
-        instance._providers[provider_type] = provider_class
+        if cls._providers.get(provider_type) is provider_class:
+            # Re-registering the same class is a no-op; keep the instance and caches
+            return
+
+        cls._providers[provider_type] = provider_class
+        # Drop any instance built from the previous class so the new one is used
+        cls._initialized_providers.pop(provider_type, None)
+        cls._invalidate_model_caches()
 
     @classmethod
     def get_provider(cls, provider_type: ProviderType, force_new: bool = False) -> Optional[ModelProvider]:
@@ -48,39 +105,47 @@ class ModelProviderRegistry:
         Returns:
             Initialized ModelProvider instance or None if not available
         """
-        instance = cls()
-
-        # Return cached instance if available and not forcing new
-        if not force_new and provider_type in instance._initialized_providers:
-            return instance._initialized_providers[provider_type]
-
-        # Check if provider class is registered
-        if provider_type not in instance._providers:
-            return None
-
-        # Get API key from environment
-        api_key = cls._get_api_key_for_provider(provider_type)
-
-        # Get provider class or factory function
-        provider_class = instance._providers[provider_type]
-
-        # Initialize provider with API key
-        if not api_key:
-            return None
-        provider = provider_class(api_key=api_key)
-
-        # Cache the instance
-        instance._initialized_providers[provider_type] = provider
-
+        # Lock-free fast path: return cached instance if available and not forcing new
+        if not force_new:
+            provider = cls._initialized_providers.get(provider_type)
+            if provider is not None:
+                return provider
+
+        with cls._init_lock:
+            # Re-check under the lock in case another thread initialized it meanwhile
+            if not force_new and provider_type in cls._initialized_providers:
+                return cls._initialized_providers[provider_type]
+
+            # Check if provider class is registered
+            if provider_type not in cls._providers:
+                return None
+
+            # Get API key from environment
+            api_key = cls._get_api_key_for_provider(provider_type)
+
+            # Get provider class or factory function
+            provider_class = cls._providers[provider_type]
+
+            # Initialize provider with API key
+            if not api_key:
+                return None
+            provider = provider_class(api_key=api_key)
+
+            # Cache the instance; a forced rebuild of the same class replaces one that was already listed
+            newly_available = provider_type not in cls._initialized_providers
+            cls._initialized_providers[provider_type] = provider
+
+        if newly_available:
+            # Listings built while this provider was missing are now incomplete
+            cls._invalidate_model_caches()
         return provider
 
     @classmethod
     def get_provider_for_model(cls, model_name: str) -> Optional[ModelProvider]:
         """Get provider instance for a specific model name.
 
-        Provider priority order:
-        1. OPENAI - OpenAI-compatible APIs (most direct and efficient)
-        2. CUSTOM - For local/private models with specific endpoints
+        Providers are checked in PROVIDER_PRIORITY_ORDER. Today that is only
+        OPENAI (OpenAI-compatible APIs, including custom endpoints).
 
         Args:
             model_name: Name of the model (e.g., "gpt-4o", "o3")
@@ -88,40 +153,53 @@ class ModelProviderRegistry:
         Returns:
             ModelProvider instance that supports this model
         """
-        logging.debug(f"get_provider_for_model called with model_name='{model_name}'")
-
-        # Define explicit provider priority order
-        # Only OpenAI-compatible APIs
-        PROVIDER_PRIORITY_ORDER = [
-            ProviderType.OPENAI,  # OpenAI compatible API access (includes custom endpoints)
-        ]
+        cls._validate_model_caches()
 
-        # Check providers in priority order
-        instance = cls()
-        logging.debug(f"Registry instance: {instance}")
-        logging.debug(f"Available providers in registry: {list(instance._providers.keys())}")
+        # Cache the matched provider type rather than the instance, which may be re-created
+        cached_type = cls._model_provider_cache.get(model_name)
+        if cached_type is not None:
+            return cls.get_provider(cached_type)
 
         for provider_type in PROVIDER_PRIORITY_ORDER:
-            if provider_type in instance._providers:
-                logging.debug(f"Found {provider_type} in registry")
-                # Get or create provider instance
-                provider = cls.get_provider(provider_type)
-                if provider and provider.validate_model_name(model_name):
-                    logging.debug(f"{provider_type} validates model {model_name}")
-                    return provider
-                else:
-                    logging.debug(f"{provider_type} does not validate model {model_name}")
-            else:
-                logging.debug(f"{provider_type} not found in registry")
-
-        logging.debug(f"No provider found for model {model_name}")
+            provider = cls.get_provider(provider_type)
+            if not provider:
+                continue
+            if provider.validate_model_name(model_name):
+                cls._model_provider_cache[model_name] = provider_type
+                return provider
+
+        logging.debug("No provider found for model %s", model_name)
         return None
 
     @classmethod
     def get_available_providers(cls) -> list[ProviderType]:
         """Get list of registered provider types."""
-        instance = cls()
-        return list(instance._providers.keys())
+        return list(cls._providers.keys())
+
+    @classmethod
+    def get_model_capabilities(cls, model_name: str, provider: ModelProvider) -> ModelCapabilities:
+        """Get capabilities for a model from the given provider, memoized per model name.
+
+        A cached entry is only reused for the same provider instance, so swapping
+        providers (or test doubles) never returns capabilities from a previous one.
+        Errors from provider.get_capabilities() propagate and are not cached.
+
+        Args:
+            model_name: Name of the model
+            provider: Provider serving the model (e.g. from get_provider_for_model())
+
+        Returns:
+            ModelCapabilities for the model
+        """
+        cls._validate_model_caches()
+
+        cached = cls._capabilities_cache.get(model_name)
+        if cached is not None and cached[0] is provider:
+            return cached[1]
+
+        capabilities = provider.get_capabilities(model_name)
+        cls._capabilities_cache[model_name] = (provider, capabilities)
+        return capabilities
 
     @classmethod
     def get_available_models(cls, respect_restrictions: bool = True) -> dict[str, ProviderType]:
@@ -133,46 +211,137 @@ class ModelProviderRegistry:
         Returns:
             Dict mapping model names to provider types
         """
-        # Import here to avoid circular imports
-        from utils.model_restrictions import get_restriction_service
+        models, _ = cls._cached_available_models(respect_restrictions)
+        return dict(models)
+
+    @classmethod
+    def _cached_available_models(
+        cls, respect_restrictions: bool
+    ) -> tuple[dict[str, ProviderType], dict[ProviderType, list[str]]]:
+        """Return the cached model-to-provider mapping and its inverse index, building both on a miss.
+
+        Both come from the same build, so a concurrent invalidation can never leave
+        a caller holding one without the other.
+
+        Args:
+            respect_restrictions: If True, filter out models not allowed by restrictions
+
+        Returns:
+            Tuple of cached dicts (model name -> provider type, provider type -> model names);
+            callers must not mutate them
+        """
+        if respect_restrictions:
+            # Only restricted listings depend on the restriction service
+            cls._validate_model_caches()
+
+        cached = cls._available_models_cache.get(respect_restrictions)
+        if cached is not None:
+            return cached
 
-        restriction_service = get_restriction_service() if respect_restrictions else None
         models: dict[str, ProviderType] = {}
-        instance = cls()
+        # Inverse index so per-provider name lookups don't rescan the whole mapping
+        provider_to_models: dict[ProviderType, list[str]] = {}
 
-        for provider_type in instance._providers:
+        for provider_type in cls._providers:
             provider = cls.get_provider(provider_type)
             if not provider:
                 continue
 
             try:
-                available = provider.list_models(respect_restrictions=respect_restrictions)
+                available = cls._list_provider_models(provider_type, provider, respect_restrictions)
             except NotImplementedError:
                 logging.warning("Provider %s does not implement list_models", provider_type)
                 continue
 
-            for model_name in available:
-                # =====================================================================================
-                # CRITICAL: Prevent double restriction filtering (Fixed Issue #98)
-                # =====================================================================================
-                # Previously, both the provider AND registry applied restrictions, causing
-                # double-filtering that resulted in "no models available" errors.
-                #
-                # Logic: If respect_restrictions=True, provider already filtered models,
-                # so registry should NOT filter them again.
-                # TEST COVERAGE: tests/test_provider_routing_bugs.py::TestOpenRouterAliasRestrictions
-                # =====================================================================================
-                if (
-                    restriction_service
-                    and not respect_restrictions  # Only filter if provider didn't already filter
-                    and not restriction_service.is_allowed(provider_type, model_name)
-                ):
-                    logging.debug("Model %s filtered by restrictions", model_name)
-                    continue
-                models[model_name] = provider_type
+            # =====================================================================================
+            # CRITICAL: Prevent double restriction filtering (Fixed Issue #98)
+            # =====================================================================================
+            # Previously, both the provider AND registry applied restrictions, causing
+            # double-filtering that resulted in "no models available" errors.
+            #
+            # Logic: If respect_restrictions=True, provider already filtered models,
+            # so registry should NOT filter them again. With respect_restrictions=False
+            # nothing is filtered at all, so the registry never consults restrictions here.
+            # TEST COVERAGE: tests/test_provider_routing_bugs.py::TestOpenRouterAliasRestrictions
+            # =====================================================================================
+            models.update(dict.fromkeys(available, provider_type))
+            # Built from this provider's own listing, so a name another provider also
+            # serves still counts as available here
+            provider_to_models[provider_type] = list(dict.fromkeys(available))
+
+        cls._available_models_cache[respect_restrictions] = (models, provider_to_models)
+        return models, provider_to_models
 
+    @classmethod
+    def _list_provider_models(
+        cls, provider_type: ProviderType, provider: ModelProvider, respect_restrictions: bool
+    ) -> list[str]:
+        """Return provider.list_models(), cached per (provider_type, respect_restrictions).
+
+        Args:
+            provider_type: Type of the provider being listed
+            provider: Initialized provider instance
+            respect_restrictions: Passed through to provider.list_models()
+
+        Returns:
+            List of model names (callers must not mutate it)
+        """
+        key = (provider_type, respect_restrictions)
+        models = cls._model_list_cache.get(key)
+        if models is None:
+            models = [sys.intern(name) for name in provider.list_models(respect_restrictions=respect_restrictions)]
+            cls._model_list_cache[key] = models
         return models
 
+    @classmethod
+    def _validate_model_caches(cls):
+        """Drop cached model listings if the restriction service has been reloaded.
+
+        Returns:
+            The current ModelRestrictionService instance
+        """
+        restrictions = cls._restrictions_module
+        if restrictions is None:
+            # Import here to avoid circular imports
+            import utils.model_restrictions as restrictions
+
+            cls._restrictions_module = restrictions
+
+        # Fast path for every lookup: the module still holds the service we validated against,
+        # and get_restriction_service() hasn't been swapped out (e.g. patched by a test)
+        current_service = restrictions._restriction_service
+        if (
+            current_service is not None
+            and current_service is cls._cached_restriction_service
+            and restrictions.get_restriction_service is cls._cached_restriction_getter
+        ):
+            return current_service
+
+        cls._cached_restriction_getter = restrictions.get_restriction_service
+        current_service = restrictions.get_restriction_service()
+        if cls._cached_restriction_service is not current_service:
+            cls._invalidate_model_caches()
+            cls._cached_restriction_service = current_service
+        return current_service
+
+    @classmethod
+    def configuration_version(cls) -> int:
+        """Return a counter that changes whenever registered providers or restrictions change.
+
+        Callers can key their own derived caches on this value.
+        """
+        cls._validate_model_caches()
+        return cls._configuration_version
+
+    @classmethod
+    def _invalidate_model_caches(cls) -> None:
+        """Drop cached model listings so they are rebuilt on next access."""
+        cls._available_models_cache.clear()
+        cls._model_list_cache.clear()
+        cls._model_provider_cache.clear()
+        cls._capabilities_cache.clear()
+        cls._configuration_version += 1
+
     @classmethod
     def get_available_model_names(cls, provider_type: Optional[ProviderType] = None) -> list[str]:
         """Get list of available model names, optionally filtered by provider.
@@ -185,14 +354,38 @@ class ModelProviderRegistry:
         Returns:
             List of available model names
         """
-        available_models = cls.get_available_models(respect_restrictions=True)
-
         if provider_type:
-            # Filter by specific provider
-            return [name for name, ptype in available_models.items() if ptype == provider_type]
-        else:
-            # Return all available models
-            return list(available_models.keys())
+            _, provider_to_models = cls._cached_available_models(respect_restrictions=True)
+            # Copy so callers can't mutate the cached index
+            return provider_to_models.get(provider_type, []).copy()
+
+        # Return all available models
+        return cls._list_all_model_names(respect_restrictions=True)
+
+    @classmethod
+    def _list_all_model_names(cls, respect_restrictions: bool = True) -> list[str]:
+        """Get model names from every provider without building the model-to-provider mapping.
+
+        Args:
+            respect_restrictions: Passed through to each provider's list_models()
+
+        Returns:
+            Deduplicated list of model names, in the same order as get_available_models()
+        """
+        cls._validate_model_caches()
+
+        def provider_models():
+            for provider_type in cls._providers:
+                provider = cls.get_provider(provider_type)
+                if not provider:
+                    continue
+                try:
+                    yield cls._list_provider_models(provider_type, provider, respect_restrictions)
+                except NotImplementedError:
+                    logging.warning("Provider %s does not implement list_models", provider_type)
+
+        # dict.fromkeys deduplicates while keeping first-seen order
+        return list(dict.fromkeys(itertools.chain.from_iterable(provider_models())))
 
     @classmethod
     def _get_api_key_for_provider(cls, provider_type: ProviderType) -> Optional[str]:
@@ -204,15 +397,24 @@ class ModelProviderRegistry:
         Returns:
             API key string or None if not found
         """
-        key_mapping = {
-            ProviderType.OPENAI: "OPENAI_API_KEY",
-        }
-
-        env_var = key_mapping.get(provider_type)
-        if not env_var:
-            return None
+        env_var = cls._API_KEY_ENV.get(provider_type)
+        return os.getenv(env_var) if env_var else None
 
-        return os.getenv(env_var)
+    @classmethod
+    def _get_fallback_table(cls) -> dict[Optional["ToolModelCategory"], tuple[tuple[str, ...], str]]:
+        """Return the fallback rows keyed by ToolModelCategory, building the table on first use."""
+        table = cls._fallback_table
+        if table is None:
+            # Import here to avoid circular imports
+            from tools.models import ToolModelCategory
+
+            table = {
+                ToolModelCategory.EXTENDED_REASONING: _EXTENDED_REASONING_FALLBACK,
+                ToolModelCategory.FAST_RESPONSE: _FAST_RESPONSE_FALLBACK,
+                None: _DEFAULT_FALLBACK,
+            }
+            cls._fallback_table = table
+        return table
 
     @classmethod
     def get_preferred_fallback_model(cls, tool_category: Optional["ToolModelCategory"] = None) -> str:
@@ -229,63 +431,29 @@ class ModelProviderRegistry:
         Returns:
             Model name string for fallback use
         """
-        # Import here to avoid circular import
-        from tools.models import ToolModelCategory
-
         # Get available models respecting restrictions
         available_models = cls.get_available_models(respect_restrictions=True)
 
         # Group by provider
         openai_models = [m for m, p in available_models.items() if p == ProviderType.OPENAI]
+        # Set for O(1) membership checks; the list keeps provider order for the "first available" fallback
+        openai_set = frozenset(openai_models)
+
+        priorities, default = cls._get_fallback_table().get(tool_category, _DEFAULT_FALLBACK)
 
-        openai_available = bool(openai_models)
-
-        if tool_category == ToolModelCategory.EXTENDED_REASONING:
-            # Prefer thinking-capable models for deep reasoning tools
-            if openai_available and "o3" in openai_models:
-                return "o3"  # O3 for deep reasoning
-            elif openai_available and "o3-pro" in openai_models:
-                return "o3-pro"  # O3-Pro for complex reasoning
-            elif openai_available and "deepseek-r1" in openai_models:
-                return "deepseek-r1"  # DeepSeek R1 with thinking mode
-            elif openai_available and openai_models:
-                # Fall back to any available OpenAI model
-                return openai_models[0]
-            else:
-                # Fallback to a default OpenAI-compatible model
-                return "gpt-4"
-
-        elif tool_category == ToolModelCategory.FAST_RESPONSE:
-            # Prefer fast, cost-efficient models
-            if openai_available and "flash" in openai_models:
-                return "flash"  # Gemini Flash for speed
-            elif openai_available and "gpt-4o-mini" in openai_models:
-                return "gpt-4o-mini"  # Fast GPT-4 variant
-            elif openai_available and "o3" in openai_models:
-                return "o3"  # O3 for reasoning
-            elif openai_available and openai_models:
-                # Fall back to any available OpenAI model
-                return openai_models[0]
-            else:
-                # Default to a fast OpenAI-compatible model
-                return "gpt-4o-mini"
-
-        # BALANCED or no category specified - use existing balanced logic
-        if openai_available and "o3" in openai_models:
-            return "o3"  # O3 for balanced reasoning
-        elif openai_available and "pro" in openai_models:
-            return "pro"  # Gemini Pro for balanced performance
-        elif openai_available and "gpt-4o" in openai_models:
-            return "gpt-4o"  # Balanced GPT-4 variant
-        elif openai_available and openai_models:
+        for model in priorities:
+            if model in openai_set:
+                return model
+
+        if openai_models:
+            # Fall back to any available OpenAI model
             return openai_models[0]
-        else:
-            # No models available due to restrictions - check if any providers exist
-            if not available_models:
-                # This might happen if all models are restricted
-                logging.warning("No models available due to restrictions")
-            # Return a reasonable default for backward compatibility
-            return "gpt-4o"
+
+        if not available_models:
+            # This might happen if all models are restricted
+            logging.warning("No models available due to restrictions")
+        # Return a reasonable default OpenAI-compatible model for backward compatibility
+        return default
 
     @classmethod
     def _find_extended_thinking_model(cls) -> Optional[str]:
@@ -299,14 +467,11 @@ class ModelProviderRegistry:
         if openai_provider:
             try:
                 # For OpenAI-compatible providers, look for models that support extended thinking
-                models = openai_provider.list_models(respect_restrictions=True)
-                # Prefer models known for deep reasoning
-                preferred_models = [
-                    "deepseek-r1", "o3", "o3-pro", "gpt-4o", "claude-3-opus", "claude-3-sonnet",
-                    "gemini-2.5-pro", "llama-3.1-70b", "mixtral-8x7b"
-                ]
-                for model in preferred_models:
-                    if model in models:
+                cls._validate_model_caches()
+                models = cls._list_provider_models(ProviderType.OPENAI, openai_provider, respect_restrictions=True)
+                models_set = set(models)
+                for model in _PREFERRED_THINKING:
+                    if model in models_set:
                         return model
                 # Fallback to first available model
                 if models:
@@ -323,22 +488,42 @@ class ModelProviderRegistry:
         Returns:
             List of ProviderType values for providers with valid API keys
         """
-        available = []
-        instance = cls()
-        for provider_type in instance._providers:
-            if cls.get_provider(provider_type) is not None:
-                available.append(provider_type)
-        return available
+        # Only the API key presence matters here, so avoid instantiating providers
+        return [pt for pt in cls._providers if cls._get_api_key_for_provider(pt)]
 
     @classmethod
     def clear_cache(cls) -> None:
         """Clear cached provider instances."""
-        instance = cls()
-        instance._initialized_providers.clear()
+        cls._initialized_providers.clear()
+        cls._invalidate_model_caches()
 
     @classmethod
     def unregister_provider(cls, provider_type: ProviderType) -> None:
         """Unregister a provider (mainly for testing)."""
-        instance = cls()
-        instance._providers.pop(provider_type, None)
-        instance._initialized_providers.pop(provider_type, None)
+        cls._providers.pop(provider_type, None)
+        cls._initialized_providers.pop(provider_type, None)
+        cls._invalidate_model_caches()
+
+    @classmethod
+    def reset_for_testing(cls, env: Optional[Mapping[str, str]] = None) -> None:
+        """Forget all registered providers and cached state (mainly for testing).
+
+        Args:
+            env: If given, re-register every provider whose API key variable is set in
+                this mapping (e.g. os.environ), the way server startup would, without
+                reloading config. Provider instances still read their key from os.environ.
+        """
+        cls._providers.clear()
+        cls._initialized_providers.clear()
+        cls._invalidate_model_caches()
+        cls._cached_restriction_service = None
+        cls._cached_restriction_getter = None
+
+        if env is not None:
+            # Import here to avoid circular imports
+            from .openai_provider import OpenAIModelProvider
+
+            provider_classes = {ProviderType.OPENAI: OpenAIModelProvider}
+            for provider_type, env_var in cls._API_KEY_ENV.items():
+                if env.get(env_var):
+                    cls.register_provider(provider_type, provider_classes[provider_type])
@@ -69,6 +69,49 @@ class TestConversationMemory:
         assert context.tool_name == "chat"
         mock_client.get.assert_called_once_with(f"thread:{test_uuid}")
 
+    @patch("utils.conversation_memory.get_storage")
+    def test_get_thread_reads_msgpack_payload(self, mock_storage):
+        """Test that MessagePack-encoded threads are detected and decoded"""
+        msgpack = pytest.importorskip("msgpack")
+        mock_client = Mock()
+        mock_storage.return_value = mock_client
+
+        test_uuid = "12345678-1234-1234-1234-123456789012"
+        context_obj = ThreadContext(
+            thread_id=test_uuid,
+            created_at="2023-01-01T00:00:00Z",
+            last_updated_at="2023-01-01T00:01:00Z",
+            tool_name="chat",
+            turns=[ConversationTurn(role="user", content="Hi", timestamp="2023-01-01T00:00:30Z")],
+            initial_context={"prompt": "test"},
+        )
+        mock_client.get.return_value = msgpack.packb(context_obj.model_dump(mode="json"), use_bin_type=True)
+
+        assert get_thread(test_uuid) == context_obj
+
+    @patch("utils.conversation_memory.get_storage")
+    def test_create_and_get_thread_round_trip_msgpack(self, mock_storage, monkeypatch):
+        """Test that threads written with CONVERSATION_SERIALIZER=msgpack read back unchanged"""
+        pytest.importorskip("msgpack")
+        monkeypatch.setattr("utils.conversation_memory.CONVERSATION_SERIALIZER", "msgpack")
+
+        stored = {}
+        mock_client = Mock()
+        mock_client.setex.side_effect = lambda key, ttl, value: stored.__setitem__(key, value)
+        mock_client.get.side_effect = stored.get
+        mock_storage.return_value = mock_client
+
+        thread_id = create_thread("chat", {"prompt": "Hello", "files": ["/test.py"]})
+
+        payload = stored[f"thread:{thread_id}"]
+        assert isinstance(payload, bytes) and not payload.startswith(b"{")
+
+        context = get_thread(thread_id)
+        assert context is not None
+        assert context.thread_id == thread_id
+        assert context.tool_name == "chat"
+        assert context.initial_context == {"prompt": "Hello", "files": ["/test.py"]}
+
     @patch("utils.conversation_memory.get_storage")
     def test_get_thread_invalid_uuid(self, mock_storage):
         """Test handling invalid UUID"""
@@ -8,11 +8,14 @@ Tests the complete image support pipeline:
 - Cross-tool image context preservation
 """
 
+import itertools
 import json
 import os
 import tempfile
 import uuid
-from unittest.mock import Mock, patch
+from contextlib import ExitStack
+from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
@@ -24,9 +27,91 @@ from utils.conversation_memory import (
     add_turn,
     create_thread,
     get_conversation_image_list,
+    get_conversation_image_list_across_chain,
     get_thread,
+    get_thread_chain,
 )
 
+# Minimal valid 1x1 PNG used as an image attachment
+_MIN_PNG_BYTES = (
+    b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x06\x00\x00\x00\x1f\x15\xc4\x89"
+    b"\x00\x00\x00\rIDATx\x9cc\x00\x01\x00\x00\x05\x00\x01\r\n-\xdb\x00\x00\x00\x00IEND\xaeB`\x82"
+)
+
+
+def _sparse_image(stack: ExitStack, size: int) -> str:
+    """Create a sparse .png temp file of the given size, deleted when the stack exits.
+
+    Image validation only stats the file, so no data needs to be written.
+    """
+    with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as temp_file:
+        stack.callback(Path(temp_file.name).unlink, missing_ok=True)
+        os.ftruncate(temp_file.fileno(), size)
+    return temp_file.name
+
+
+# Deterministic, UUID-formatted thread ids for contexts built directly in tests
+_thread_ids = itertools.count(1)
+
+
+def _next_thread_id() -> str:
+    return str(uuid.UUID(int=next(_thread_ids)))
+
+
+class _FakeStorage(dict):
+    """Dict-backed stand-in for the conversation storage backend"""
+
+    def setex(self, key, ttl_seconds, value):
+        self[key] = value
+
+    def set(self, key, value, *args, **kwargs):
+        self[key] = value
+        return True
+
+    def mget(self, keys):
+        return [dict.get(self, key) for key in keys]
+
+
+@pytest.fixture(autouse=True)
+def fake_storage(monkeypatch):
+    """Route conversation memory through a fresh in-memory store for every test"""
+    storage = _FakeStorage()
+    monkeypatch.setattr("utils.conversation_memory.get_storage", lambda: storage)
+    return storage
+
+
+@pytest.fixture(scope="module")
+def chat_tool():
+    """ChatTool shared across the module; the tests below don't mutate it"""
+    return ChatTool()
+
+
+@pytest.fixture(scope="module")
+def chat_schema(chat_tool):
+    """ChatTool input schema, built once per module"""
+    return chat_tool.get_input_schema()
+
+
+@pytest.fixture(scope="module")
+def debug_tool():
+    """DebugIssueTool shared across the module; the tests below don't mutate it"""
+    return DebugIssueTool()
+
+
+@pytest.fixture(scope="module")
+def debug_schema(debug_tool):
+    """DebugIssueTool input schema, built once per module"""
+    return debug_tool.get_input_schema()
+
+
+@pytest.fixture
+def fresh_registry():
+    """Rebuild the provider registry from a given environment; reset it again afterwards"""
+    from providers.registry import ModelProviderRegistry
+
+    yield ModelProviderRegistry.reset_for_testing
+    ModelProviderRegistry.reset_for_testing()
+
 
 @pytest.mark.no_mock_provider
 class TestImageSupportIntegration:
@@ -51,7 +136,7 @@ class TestImageSupportIntegration:
         """Test that image list prioritizes newest references."""
         # Create thread context with multiple turns
         context = ThreadContext(
-            thread_id=str(uuid.uuid4()),
+            thread_id=_next_thread_id(),
             created_at="2025-01-01T00:00:00Z",
             last_updated_at="2025-01-01T00:00:00Z",
             tool_name="chat",
@@ -81,28 +166,10 @@ class TestImageSupportIntegration:
         expected = ["shared.png", "new_diagram.png", "middle.png", "old_diagram.png"]
         assert image_list == expected
 
-    @patch("utils.conversation_memory.get_storage")
-    def test_add_turn_with_images(self, mock_storage):
+    def test_add_turn_with_images(self):
         """Test adding a conversation turn with images."""
-        mock_client = Mock()
-        mock_storage.return_value = mock_client
-
-        # Mock the Redis operations to return success
-        mock_client.set.return_value = True
-
         thread_id = create_thread("test_tool", {"initial": "context"})
 
-        # Set up initial thread context for add_turn to find
-        initial_context = ThreadContext(
-            thread_id=thread_id,
-            created_at="2025-01-01T00:00:00Z",
-            last_updated_at="2025-01-01T00:00:00Z",
-            tool_name="test_tool",
-            turns=[],  # Empty initially
-            initial_context={"initial": "context"},
-        )
-        mock_client.get.return_value = initial_context.model_dump_json()
-
         success = add_turn(
             thread_id=thread_id,
             role="user",
@@ -114,27 +181,7 @@ class TestImageSupportIntegration:
 
         assert success
 
-        # Mock thread context for get_thread call
-        updated_context = ThreadContext(
-            thread_id=thread_id,
-            created_at="2025-01-01T00:00:00Z",
-            last_updated_at="2025-01-01T00:00:00Z",
-            tool_name="test_tool",
-            turns=[
-                ConversationTurn(
-                    role="user",
-                    content="Analyze these screenshots",
-                    timestamp="2025-01-01T00:00:00Z",
-                    files=["app.py"],
-                    images=["screenshot1.png", "screenshot2.png"],
-                    tool_name="debug",
-                )
-            ],
-            initial_context={"initial": "context"},
-        )
-        mock_client.get.return_value = updated_context.model_dump_json()
-
-        # Retrieve and verify the thread
+        # Retrieve and verify the thread as stored by add_turn
         context = get_thread(thread_id)
         assert context is not None
         assert len(context.turns) == 1
@@ -144,41 +191,27 @@ class TestImageSupportIntegration:
         assert turn.files == ["app.py"]
         assert turn.content == "Analyze these screenshots"
 
-    def test_chat_tool_schema_includes_images(self):
-        """Test that ChatTool schema includes images field."""
-        tool = ChatTool()
-        schema = tool.get_input_schema()
+    @pytest.mark.parametrize(
+        "schema_fixture, needle", [("chat_schema", "visual context"), ("debug_schema", "screenshots")]
+    )
+    def test_tool_schema_includes_images(self, request, schema_fixture, needle):
+        """Test that ChatTool and DebugIssueTool schemas include the images field."""
+        schema = request.getfixturevalue(schema_fixture)
 
         assert "images" in schema["properties"]
         images_field = schema["properties"]["images"]
         assert images_field["type"] == "array"
         assert images_field["items"]["type"] == "string"
-        assert "visual context" in images_field["description"].lower()
+        assert needle in images_field["description"].lower()
 
-    def test_debug_tool_schema_includes_images(self):
-        """Test that DebugIssueTool schema includes images field."""
-        tool = DebugIssueTool()
-        schema = tool.get_input_schema()
-
-        assert "images" in schema["properties"]
-        images_field = schema["properties"]["images"]
-        assert images_field["type"] == "array"
-        assert images_field["items"]["type"] == "string"
-        assert "screenshots" in images_field["description"].lower()
-
-    def test_tool_image_validation_limits(self):
+    def test_tool_image_validation_limits(self, chat_tool):
         """Test that tools validate image size limits using real provider resolution."""
-        tool = ChatTool()
+        tool = chat_tool
 
-        # Create small test images (each 0.5MB, total 1MB)
-        small_images = []
-        for _ in range(2):
-            with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as temp_file:
-                # Write 0.5MB of data
-                temp_file.write(b"\x00" * (512 * 1024))
-                small_images.append(temp_file.name)
+        # Create small test images (each 0.5MB, total 1MB), removed when the stack exits
+        with ExitStack() as stack:
+            small_images = [_sparse_image(stack, 512 * 1024) for _ in range(2)]
 
-        try:
             # Test with an invalid model name that doesn't exist in any provider
             result = tool._validate_image_limits(small_images, "non-existent-model-12345")
             # Should return error because model not available or doesn't support images
@@ -186,42 +219,21 @@ class TestImageSupportIntegration:
             assert result["status"] == "error"
             assert "is not available" in result["content"] or "does not support image processing" in result["content"]
 
-            # Test that empty/None images always pass regardless of model
-            result = tool._validate_image_limits([], "any-model")
-            assert result is None
-
-            result = tool._validate_image_limits(None, "any-model")
-            assert result is None
-
-        finally:
-            # Clean up temp files
-            for img_path in small_images:
-                if os.path.exists(img_path):
-                    os.unlink(img_path)
-
     def test_image_validation_model_specific_limits(self):
         """Test that different models have appropriate size limits using real provider resolution."""
         tool = ChatTool()
 
         # Test with Gemini model which has better image support in test environment
-        # Create 15MB image (under default limits)
-        small_image_path = None
-        large_image_path = None
-
-        try:
-            # Create 15MB image
-            with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as temp_file:
-                temp_file.write(b"\x00" * (15 * 1024 * 1024))  # 15MB
-                small_image_path = temp_file.name
+        with ExitStack() as stack:
+            # Create 15MB image (under default limits)
+            small_image_path = _sparse_image(stack, 15 * 1024 * 1024)
 
             # Test with the default model from test environment (gemini-2.5-flash)
             result = tool._validate_image_limits([small_image_path], "gemini-2.5-flash")
             assert result is None  # Should pass for Gemini models
 
             # Create 150MB image (over typical limits)
-            with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as temp_file:
-                temp_file.write(b"\x00" * (150 * 1024 * 1024))  # 150MB
-                large_image_path = temp_file.name
+            large_image_path = _sparse_image(stack, 150 * 1024 * 1024)
 
             result = tool._validate_image_limits([large_image_path], "gemini-2.5-flash")
             # Large images should fail validation
@@ -229,54 +241,31 @@ class TestImageSupportIntegration:
             assert result["status"] == "error"
             assert "Image size limit exceeded" in result["content"]
 
-        finally:
-            # Clean up temp files
-            if small_image_path and os.path.exists(small_image_path):
-                os.unlink(small_image_path)
-            if large_image_path and os.path.exists(large_image_path):
-                os.unlink(large_image_path)
-
     @pytest.mark.asyncio
-    async def test_chat_tool_execution_with_images(self):
+    async def test_chat_tool_execution_with_images(self, monkeypatch, fresh_registry):
         """Test that ChatTool can execute with images parameter using real provider resolution."""
-        import importlib
-
-        # Create a temporary image file for testing
-        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as temp_file:
-            # Write a simple PNG header (minimal valid PNG)
-            png_header = b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x06\x00\x00\x00\x1f\x15\xc4\x89\x00\x00\x00\rIDATx\x9cc\x00\x01\x00\x00\x05\x00\x01\r\n-\xdb\x00\x00\x00\x00IEND\xaeB`\x82"
-            temp_file.write(png_header)
-            temp_image_path = temp_file.name
-
-        # Save original environment
-        original_env = {
-            "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY"),
-            "DEFAULT_MODEL": os.environ.get("DEFAULT_MODEL"),
-        }
-
-        try:
-            # Set up environment for real provider resolution
-            os.environ["OPENAI_API_KEY"] = "sk-test-key-images-test-not-real"
-            os.environ["DEFAULT_MODEL"] = "gpt-4o"
-
-            # Clear other provider keys to isolate to OpenAI
-            for key in ["GEMINI_API_KEY", "XAI_API_KEY", "OPENROUTER_API_KEY"]:
-                os.environ.pop(key, None)
+        # Set up environment for real provider resolution; monkeypatch restores it afterwards
+        monkeypatch.setenv("OPENAI_API_KEY", "sk-test-key-images-test-not-real")
+        monkeypatch.setenv("DEFAULT_MODEL", "gpt-4o")
+        monkeypatch.setattr("config.DEFAULT_MODEL", "gpt-4o")
 
-            # Reload config and clear registry
-            import config
+        # Clear other provider keys to isolate to OpenAI
+        for key in ["GEMINI_API_KEY", "XAI_API_KEY", "OPENROUTER_API_KEY"]:
+            monkeypatch.delenv(key, raising=False)
 
-            importlib.reload(config)
-            from providers.registry import ModelProviderRegistry
+        fresh_registry(os.environ)
 
-            ModelProviderRegistry._instance = None
+        tool = ChatTool()
 
-            tool = ChatTool()
+        # Temporary image file is removed when the context manager exits
+        with tempfile.NamedTemporaryFile(suffix=".png") as temp_file:
+            temp_file.write(_MIN_PNG_BYTES)
+            temp_file.flush()
 
             # Test with real provider resolution
             try:
                 result = await tool.execute(
-                    {"prompt": "What do you see in this image?", "images": [temp_image_path], "model": "gpt-4o"}
+                    {"prompt": "What do you see in this image?", "images": [temp_file.name], "model": "gpt-4o"}
                 )
 
                 # If we get here, check the response format
@@ -300,44 +289,11 @@ class TestImageSupportIntegration:
                 )
                 # Test passed - provider processed images parameter before failing on auth
 
-        finally:
-            # Clean up temp file
-            os.unlink(temp_image_path)
-
-            # Restore environment
-            for key, value in original_env.items():
-                if value is not None:
-                    os.environ[key] = value
-                else:
-                    os.environ.pop(key, None)
-
-            # Reload config and clear registry
-            importlib.reload(config)
-            ModelProviderRegistry._instance = None
-
-    @patch("utils.conversation_memory.get_storage")
-    def test_cross_tool_image_context_preservation(self, mock_storage):
+    def test_cross_tool_image_context_preservation(self):
         """Test that images are preserved across different tools in conversation."""
-        mock_client = Mock()
-        mock_storage.return_value = mock_client
-
-        # Mock the Redis operations to return success
-        mock_client.set.return_value = True
-
         # Create initial thread with chat tool
         thread_id = create_thread("chat", {"initial": "context"})
 
-        # Set up initial thread context for add_turn to find
-        initial_context = ThreadContext(
-            thread_id=thread_id,
-            created_at="2025-01-01T00:00:00Z",
-            last_updated_at="2025-01-01T00:00:00Z",
-            tool_name="chat",
-            turns=[],  # Empty initially
-            initial_context={"initial": "context"},
-        )
-        mock_client.get.return_value = initial_context.model_dump_json()
-
         # Add turn with images from chat tool
         add_turn(
             thread_id=thread_id,
@@ -361,39 +317,6 @@ class TestImageSupportIntegration:
             tool_name="debug",
         )
 
-        # Mock complete thread context for get_thread call
-        complete_context = ThreadContext(
-            thread_id=thread_id,
-            created_at="2025-01-01T00:00:00Z",
-            last_updated_at="2025-01-01T00:05:00Z",
-            tool_name="chat",
-            turns=[
-                ConversationTurn(
-                    role="user",
-                    content="Here's my UI design",
-                    timestamp="2025-01-01T00:01:00Z",
-                    images=["design.png", "mockup.jpg"],
-                    tool_name="chat",
-                ),
-                ConversationTurn(
-                    role="assistant",
-                    content="I can see your design. It looks good!",
-                    timestamp="2025-01-01T00:02:00Z",
-                    tool_name="chat",
-                ),
-                ConversationTurn(
-                    role="user",
-                    content="Now I'm getting this error",
-                    timestamp="2025-01-01T00:03:00Z",
-                    images=["error_screen.png"],
-                    files=["error.log"],
-                    tool_name="debug",
-                ),
-            ],
-            initial_context={"initial": "context"},
-        )
-        mock_client.get.return_value = complete_context.model_dump_json()
-
         # Retrieve thread and check image preservation
         context = get_thread(thread_id)
         assert context is not None
@@ -420,9 +343,9 @@ class TestImageSupportIntegration:
         request_no_images = ToolRequest()
         assert request_no_images.images is None
 
-    def test_data_url_image_format_support(self):
+    def test_data_url_image_format_support(self, chat_tool):
         """Test that tools can handle data URL format images."""
-        tool = ChatTool()
+        tool = chat_tool
 
         # Test with data URL (base64 encoded 1x1 transparent PNG)
         data_url = "data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
@@ -441,40 +364,25 @@ class TestImageSupportIntegration:
         assert result is not None
         assert result["status"] == "error"
 
-    def test_empty_images_handling(self):
-        """Test that tools handle empty images lists gracefully."""
-        tool = ChatTool()
+    @pytest.mark.parametrize("tool_fixture", ["chat_tool", "debug_tool"])
+    @pytest.mark.parametrize("images", [[], None])
+    def test_empty_images_handling(self, request, tool_fixture, images):
+        """Test that tools handle empty/None images gracefully (no need for provider setup)."""
+        tool = request.getfixturevalue(tool_fixture)
 
-        # Empty list should not fail validation (no need for provider setup)
-        result = tool._validate_image_limits([], "test_model")
-        assert result is None
+        assert tool._validate_image_limits(images, "test_model") is None
 
-        # None should not fail validation (no need for provider setup)
-        result = tool._validate_image_limits(None, "test_model")
-        assert result is None
+    @patch("providers.registry.ModelProviderRegistry.get_provider_for_model", side_effect=AssertionError)
+    def test_empty_images_skip_model_resolution(self, mock_get_provider, chat_tool):
+        """Test that empty/None images return before any provider lookup."""
+        assert chat_tool._validate_image_limits([], "test_model") is None
+        assert chat_tool._validate_image_limits(None, "test_model") is None
+        mock_get_provider.assert_not_called()
 
-    @patch("utils.conversation_memory.get_storage")
-    def test_conversation_memory_thread_chaining_with_images(self, mock_storage):
+    def test_conversation_memory_thread_chaining_with_images(self):
         """Test that images work correctly with conversation thread chaining."""
-        mock_client = Mock()
-        mock_storage.return_value = mock_client
-
-        # Mock the Redis operations to return success
-        mock_client.set.return_value = True
-
         # Create parent thread with images
         parent_thread_id = create_thread("chat", {"parent": "context"})
-
-        # Set up initial parent thread context for add_turn to find
-        parent_context = ThreadContext(
-            thread_id=parent_thread_id,
-            created_at="2025-01-01T00:00:00Z",
-            last_updated_at="2025-01-01T00:00:00Z",
-            tool_name="chat",
-            turns=[],  # Empty initially
-            initial_context={"parent": "context"},
-        )
-        mock_client.get.return_value = parent_context.model_dump_json()
         add_turn(
             thread_id=parent_thread_id,
             role="user",
@@ -493,26 +401,6 @@ class TestImageSupportIntegration:
             tool_name="chat",
         )
 
-        # Mock child thread context for get_thread call
-        child_context = ThreadContext(
-            thread_id=child_thread_id,
-            created_at="2025-01-01T00:00:00Z",
-            last_updated_at="2025-01-01T00:02:00Z",
-            tool_name="debug",
-            turns=[
-                ConversationTurn(
-                    role="user",
-                    content="Child thread with more images",
-                    timestamp="2025-01-01T00:02:00Z",
-                    images=["child1.png", "shared.png"],
-                    tool_name="debug",
-                )
-            ],
-            initial_context={"child": "context"},
-            parent_thread_id=parent_thread_id,
-        )
-        mock_client.get.return_value = child_context.model_dump_json()
-
         # Get child thread and verify image collection works across chain
         child_context = get_thread(child_thread_id)
         assert child_context is not None
@@ -521,3 +409,58 @@ class TestImageSupportIntegration:
         # Test image collection for child thread only
         child_images = get_conversation_image_list(child_context)
         assert child_images == ["child1.png", "shared.png"]
+
+        # Test image collection across the parent chain (child images first, shared.png kept from child)
+        chain_images = get_conversation_image_list_across_chain(child_context)
+        assert chain_images == ["child1.png", "shared.png", "parent1.png"]
+
+    def test_thread_chain_is_fetched_in_one_batch(self, fake_storage):
+        """Test that recorded ancestors are read with a single mget instead of one get per hop."""
+        root_id = create_thread("chat", {"prompt": "root"})
+        add_turn(root_id, "user", "Root", images=["root.png"], tool_name="chat")
+        parent_id = create_thread("chat", {"prompt": "parent"}, parent_thread_id=root_id)
+        add_turn(parent_id, "user", "Parent", images=["parent.png", "root.png"], tool_name="chat")
+        child_id = create_thread("chat", {"prompt": "child"}, parent_thread_id=parent_id)
+
+        child_context = get_thread(child_id)
+        assert child_context.ancestor_thread_ids == [parent_id, root_id]
+
+        with patch.object(fake_storage, "get", wraps=fake_storage.get) as mock_get:
+            with patch.object(fake_storage, "mget", wraps=fake_storage.mget) as mock_mget:
+                chain = get_thread_chain(child_id)
+                chain_images = get_conversation_image_list_across_chain(child_context)
+
+        assert [thread.thread_id for thread in chain] == [root_id, parent_id, child_id]
+        assert chain_images == ["parent.png", "root.png"]
+        assert mock_mget.call_count == 2
+        mock_get.assert_called_once_with(f"thread:{child_id}")
+
+    def test_missing_parent_records_no_ancestry(self):
+        """Test that a child of an expired or unknown parent doesn't trust a partial ancestry."""
+        missing_parent_id = _next_thread_id()
+        child_id = create_thread("chat", {"prompt": "child"}, parent_thread_id=missing_parent_id)
+
+        child_context = get_thread(child_id)
+        assert child_context.parent_thread_id == missing_parent_id
+        assert child_context.ancestor_thread_ids is None
+        assert [thread.thread_id for thread in get_thread_chain(child_id)] == [child_id]
+
+    @pytest.mark.parametrize(
+        "max_depth, expected_chain, expected_images",
+        [(0, [], []), (1, ["child"], ["child.png"]), (2, ["parent", "child"], ["child.png", "parent.png"])],
+    )
+    def test_thread_chain_respects_max_depth(self, max_depth, expected_chain, expected_images):
+        """Test that max_depth caps the chain even when the child recorded its full ancestry."""
+        thread_ids = {"root": create_thread("chat", {"prompt": "root"})}
+        add_turn(thread_ids["root"], "user", "Root", images=["root.png"], tool_name="chat")
+        thread_ids["parent"] = create_thread("chat", {"prompt": "parent"}, parent_thread_id=thread_ids["root"])
+        add_turn(thread_ids["parent"], "user", "Parent", images=["parent.png"], tool_name="chat")
+        thread_ids["child"] = create_thread("chat", {"prompt": "child"}, parent_thread_id=thread_ids["parent"])
+        add_turn(thread_ids["child"], "user", "Child", images=["child.png"], tool_name="chat")
+
+        child_context = get_thread(thread_ids["child"])
+        assert child_context.ancestor_thread_ids == [thread_ids["parent"], thread_ids["root"]]
+
+        chain = get_thread_chain(thread_ids["child"], max_depth=max_depth)
+        assert [thread.thread_id for thread in chain] == [thread_ids[name] for name in expected_chain]
+        assert get_conversation_image_list_across_chain(child_context, max_depth=max_depth) == expected_images
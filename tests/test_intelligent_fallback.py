@@ -24,7 +24,7 @@ class TestIntelligentFallback:
         self._original_initialized = registry._initialized_providers.copy()
 
         # Clear registry completely
-        ModelProviderRegistry._instance = None
+        ModelProviderRegistry.reset_for_testing()
 
     def teardown_method(self):
         """Cleanup after each test - restore original providers"""
@@ -34,6 +34,8 @@ class TestIntelligentFallback:
         registry._initialized_providers.clear()
         registry._providers.update(self._original_providers)
         registry._initialized_providers.update(self._original_initialized)
+        # Direct dict writes bypass register_provider(), so drop listings cached by this test
+        ModelProviderRegistry._invalidate_model_caches()
 
     @patch.dict(os.environ, {"OPENAI_API_KEY": "sk-test-key", "GEMINI_API_KEY": ""}, clear=False)
     def test_prefers_openai_o3_mini_when_available(self):
@@ -90,7 +92,7 @@ class TestIntelligentFallback:
 
         with patch.dict(os.environ, {"OPENAI_API_KEY": "sk-test-key", "GEMINI_API_KEY": ""}, clear=False):
             # Clear and register providers
-            ModelProviderRegistry._instance = None
+            ModelProviderRegistry.reset_for_testing()
             ModelProviderRegistry.register_provider(ProviderType.OPENAI, OpenAIModelProvider)
             ModelProviderRegistry.register_provider(ProviderType.GOOGLE, GeminiModelProvider)
 
@@ -100,7 +102,7 @@ class TestIntelligentFallback:
 
         with patch.dict(os.environ, {"OPENAI_API_KEY": "", "GEMINI_API_KEY": "test-key"}, clear=False):
             # Clear and register providers
-            ModelProviderRegistry._instance = None
+            ModelProviderRegistry.reset_for_testing()
             ModelProviderRegistry.register_provider(ProviderType.OPENAI, OpenAIModelProvider)
             ModelProviderRegistry.register_provider(ProviderType.GOOGLE, GeminiModelProvider)
 
@@ -2,28 +2,134 @@
 
 import json
 import os
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 from mcp.types import TextContent
 
+from providers.base import ModelCapabilities, ProviderType
+from providers.registry import ModelProviderRegistry
 from tools.listmodels import ListModelsTool
 
 
 class TestListModelsTool:
     """Test the ListModels tool functionality"""
 
+    @pytest.fixture(autouse=True)
+    def clear_cached_output(self):
+        """Drop any rendering cached by another test, and leave none behind"""
+        ListModelsTool._cached_output = None
+        yield
+        ListModelsTool._cached_output = None
+
     @pytest.fixture
     def tool(self):
         """Create a ListModelsTool instance"""
         return ListModelsTool()
 
+    @pytest.fixture
+    def make_capabilities(self):
+        """Factory for minimal ModelCapabilities; keyword arguments override the defaults"""
+
+        def make(model_name="m", **kwargs):
+            fields = {
+                "provider": ProviderType.OPENAI,
+                "model_name": model_name,
+                "friendly_name": model_name,
+                "context_window": 1000,
+                "max_output_tokens": 100,
+            }
+            fields.update(kwargs)
+            return ModelCapabilities(**fields)
+
+        return make
+
+    @pytest.fixture
+    def registered_mock_provider(self):
+        """Register a MagicMock as the only (OpenAI) provider, with its API key set, on a clean registry"""
+        provider = MagicMock()
+        provider.get_model_configurations.return_value = {}
+        ModelProviderRegistry.reset_for_testing()
+        with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}, clear=True):
+            ModelProviderRegistry.register_provider(ProviderType.OPENAI, MagicMock(return_value=provider))
+            yield provider
+        ModelProviderRegistry.reset_for_testing()
+
     def test_tool_metadata(self, tool):
         """Test tool has correct metadata"""
         assert tool.name == "listmodels"
         assert "LIST AVAILABLE MODELS" in tool.description
         assert tool.get_request_model().__name__ == "ToolRequest"
 
+    def test_capability_tag_declared_or_inferred(self, make_capabilities):
+        """Test that capability bullets use the declared tag, falling back to the description"""
+        from tools.listmodels import _capability_tag
+
+        declared = make_capabilities(capability_tag="deep_reasoning", description="Ultra-fast")
+        assert _capability_tag(declared) == "deep_reasoning"
+        assert _capability_tag(make_capabilities(description="Ultra-fast model")) == "ultra_fast"
+        assert _capability_tag(make_capabilities(description="Something else")) is None
+
+    @pytest.mark.parametrize(
+        "context_window, expected",
+        [(1_048_576, "1M context"), (200_000, "200K context"), (512, "512 context"), (0, "unknown context")],
+    )
+    def test_context_str_formatting(self, make_capabilities, context_window, expected):
+        """Test the display string for a model's context window"""
+        assert make_capabilities(context_window=context_window).context_str == expected
+
+    def test_build_content_renders_without_event_loop(self, tool):
+        """Test that the listing can be rendered synchronously, outside execute()"""
+        ModelProviderRegistry.reset_for_testing()
+        with patch.dict(os.environ, {}, clear=True):
+            content, configured_count = tool._build_content()
+
+        assert content.startswith("# Available AI Models\n")
+        assert "**Status**: Not configured (set OPENAI_API_KEY)" in content
+        assert configured_count == 0
+
+    @pytest.mark.asyncio
+    async def test_output_is_cached_until_configuration_changes(self, tool, registered_mock_provider):
+        """Test that repeated calls reuse the rendered output until providers change"""
+        provider = registered_mock_provider
+
+        first = await tool.execute({})
+        first[0].text = "mutated by caller"
+        second = await tool.execute({})
+        assert json.loads(second[0].text)["status"] == "success"
+        assert provider.get_model_configurations.call_count == 1
+
+        ModelProviderRegistry.register_provider(ProviderType.OPENAI, MagicMock(return_value=provider))
+        await tool.execute({})
+        assert provider.get_model_configurations.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_aliases_sorted_by_name_and_deduplicated(self, tool, registered_mock_provider, make_capabilities):
+        """Test that aliases are ordered by alias name and a shared alias is listed once"""
+        registered_mock_provider.get_model_configurations.return_value = {
+            "model-a": make_capabilities("model-a", aliases=["flash2.5", "shared"]),
+            "model-b": make_capabilities("model-b", aliases=["flash", "shared"]),
+        }
+
+        result = await tool.execute({})
+
+        content = json.loads(result[0].text)["content"]
+        assert "**Aliases**:\n- `flash` → `model-b`\n- `flash2.5` → `model-a`\n- `shared` → `model-a`\n" in content
+
+    @pytest.mark.asyncio
+    async def test_total_models_counted_from_registry_listing(self, tool, registered_mock_provider):
+        """Test that the summary total comes from the registry's cached per-provider listing"""
+        registered_mock_provider.list_models.return_value = ["o3", "flash", "o3"]
+
+        with patch.object(ModelProviderRegistry, "get_available_models") as mock_get_available:
+            result = await tool.execute({})
+            assert ModelProviderRegistry.get_available_model_names(ProviderType.OPENAI) == ["o3", "flash"]
+
+        assert "**Total Available Models**: 2" in json.loads(result[0].text)["content"]
+        # The registry listing is shared, so the later lookup didn't list models again
+        registered_mock_provider.list_models.assert_called_once_with(respect_restrictions=True)
+        mock_get_available.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_execute_with_no_providers(self, tool):
         """Test listing models with no providers configured"""
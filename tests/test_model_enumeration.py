@@ -31,7 +31,7 @@ class TestModelEnumeration:
         }
 
         # Clear provider registry
-        ModelProviderRegistry._instance = None
+        ModelProviderRegistry.reset_for_testing()
 
     def teardown_method(self):
         """Clean up after each test."""
@@ -48,7 +48,7 @@ class TestModelEnumeration:
         importlib.reload(config)
 
         # Clear provider registry
-        ModelProviderRegistry._instance = None
+        ModelProviderRegistry.reset_for_testing()
 
     def _setup_environment(self, provider_config):
         """Helper to set up environment variables for testing."""
@@ -507,11 +507,14 @@ class TestRegistryIntegration:
         mock_get_provider.side_effect = get_provider_side_effect
 
         # Set up registry with providers
-        registry = ModelProviderRegistry()
-        registry._providers = {
-            ProviderType.OPENAI: type(mock_openai),
-            ProviderType.GOOGLE: type(mock_gemini),
-        }
+        ModelProviderRegistry._providers.clear()
+        ModelProviderRegistry._providers.update(
+            {
+                ProviderType.OPENAI: type(mock_openai),
+                ProviderType.GOOGLE: type(mock_gemini),
+            }
+        )
+        ModelProviderRegistry._invalidate_model_caches()
 
         with patch.dict(os.environ, {"OPENAI_ALLOWED_MODELS": "o3-mini", "GOOGLE_ALLOWED_MODELS": "gemini-2.5-flash"}):
             # Clear cached restriction service
@@ -643,8 +646,9 @@ class TestAutoModeWithRestrictions:
         mock_get_provider.side_effect = get_provider_side_effect
 
         # Set up registry
-        registry = ModelProviderRegistry()
-        registry._providers = {ProviderType.OPENAI: type(mock_openai)}
+        ModelProviderRegistry._providers.clear()
+        ModelProviderRegistry._providers.update({ProviderType.OPENAI: type(mock_openai)})
+        ModelProviderRegistry._invalidate_model_caches()
 
         with patch.dict(os.environ, {"OPENAI_ALLOWED_MODELS": "o4-mini"}):
             # Clear cached restriction service
@@ -673,7 +677,7 @@ class TestAutoModeWithRestrictions:
 
         try:
             # Clear registry and register only OpenAI and Gemini providers
-            ModelProviderRegistry._instance = None
+            ModelProviderRegistry.reset_for_testing()
             from providers.gemini import GeminiModelProvider
             from providers.openai_provider import OpenAIModelProvider
 
@@ -694,3 +698,5 @@ class TestAutoModeWithRestrictions:
             registry._initialized_providers.clear()
             registry._providers.update(original_providers)
             registry._initialized_providers.update(original_initialized)
+            # Direct dict writes bypass register_provider(), so drop listings cached by this test
+            ModelProviderRegistry._invalidate_model_caches()
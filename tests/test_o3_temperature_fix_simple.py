@@ -7,6 +7,10 @@ for O3 models while maintaining them for regular models.
 
 from unittest.mock import Mock, patch
 
+from openai import OpenAI
+from openai.types import CompletionUsage
+from openai.types.chat import ChatCompletion
+
 from providers.openai_provider import OpenAIModelProvider
 
 
@@ -14,7 +18,7 @@ class TestO3TemperatureParameterFixSimple:
     """Simple test for O3 model parameter filtering."""
 
     @patch("utils.model_restrictions.get_restriction_service")
-    @patch("providers.openai_compatible.OpenAI")
+    @patch("providers.openai_provider.OpenAI")
     def test_o3_models_exclude_temperature_from_api_call(self, mock_openai_class, mock_restriction_service):
         """Test that O3 models don't send temperature to the API."""
         # Mock restriction service to allow all models
@@ -23,18 +27,18 @@ class TestO3TemperatureParameterFixSimple:
         mock_restriction_service.return_value = mock_service
 
         # Setup mock client
-        mock_client = Mock()
+        mock_client = Mock(spec=OpenAI)
         mock_openai_class.return_value = mock_client
 
         # Setup mock response
-        mock_response = Mock()
+        mock_response = Mock(spec=ChatCompletion)
         mock_response.choices = [Mock()]
         mock_response.choices[0].message.content = "Test response"
         mock_response.choices[0].finish_reason = "stop"
         mock_response.model = "o3-mini"
         mock_response.id = "test-id"
         mock_response.created = 1234567890
-        mock_response.usage = Mock()
+        mock_response.usage = Mock(spec=CompletionUsage)
         mock_response.usage.prompt_tokens = 10
         mock_response.usage.completion_tokens = 5
         mock_response.usage.total_tokens = 15
@@ -62,7 +66,7 @@ class TestO3TemperatureParameterFixSimple:
         assert "messages" in call_kwargs
 
     @patch("utils.model_restrictions.get_restriction_service")
-    @patch("providers.openai_compatible.OpenAI")
+    @patch("providers.openai_provider.OpenAI")
     def test_regular_models_include_temperature_in_api_call(self, mock_openai_class, mock_restriction_service):
         """Test that regular models still send temperature to the API."""
         # Mock restriction service to allow all models
@@ -71,18 +75,18 @@ class TestO3TemperatureParameterFixSimple:
         mock_restriction_service.return_value = mock_service
 
         # Setup mock client
-        mock_client = Mock()
+        mock_client = Mock(spec=OpenAI)
         mock_openai_class.return_value = mock_client
 
         # Setup mock response
-        mock_response = Mock()
+        mock_response = Mock(spec=ChatCompletion)
         mock_response.choices = [Mock()]
         mock_response.choices[0].message.content = "Test response"
         mock_response.choices[0].finish_reason = "stop"
         mock_response.model = "gpt-4.1-2025-04-14"
         mock_response.id = "test-id"
         mock_response.created = 1234567890
-        mock_response.usage = Mock()
+        mock_response.usage = Mock(spec=CompletionUsage)
         mock_response.usage.prompt_tokens = 10
         mock_response.usage.completion_tokens = 5
         mock_response.usage.total_tokens = 15
@@ -111,7 +115,7 @@ class TestO3TemperatureParameterFixSimple:
         assert call_kwargs["model"] == "gpt-4.1-2025-04-14"
 
     @patch("utils.model_restrictions.get_restriction_service")
-    @patch("providers.openai_compatible.OpenAI")
+    @patch("providers.openai_provider.OpenAI")
     def test_o3_models_filter_unsupported_parameters(self, mock_openai_class, mock_restriction_service):
         """Test that O3 models filter out top_p, frequency_penalty, etc."""
         # Mock restriction service to allow all models
@@ -120,18 +124,18 @@ class TestO3TemperatureParameterFixSimple:
         mock_restriction_service.return_value = mock_service
 
         # Setup mock client
-        mock_client = Mock()
+        mock_client = Mock(spec=OpenAI)
         mock_openai_class.return_value = mock_client
 
         # Setup mock response
-        mock_response = Mock()
+        mock_response = Mock(spec=ChatCompletion)
         mock_response.choices = [Mock()]
         mock_response.choices[0].message.content = "Test response"
         mock_response.choices[0].finish_reason = "stop"
         mock_response.model = "o3"
         mock_response.id = "test-id"
         mock_response.created = 1234567890
-        mock_response.usage = Mock()
+        mock_response.usage = Mock(spec=CompletionUsage)
         mock_response.usage.prompt_tokens = 10
         mock_response.usage.completion_tokens = 5
         mock_response.usage.total_tokens = 15
@@ -1,28 +1,69 @@
 """Tests for OpenAI provider implementation."""
 
 import os
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
+import pytest
+from openai import OpenAI
+
+import utils.model_restrictions
 from providers.base import ProviderType
 from providers.openai_provider import OpenAIModelProvider
 
 
-class TestOpenAIProvider:
-    """Test OpenAI provider functionality."""
+def _fake_usage():
+    return SimpleNamespace(prompt_tokens=10, completion_tokens=5, total_tokens=15)
+
+
+def _fake_chat_response(content="Test response", model="o3", finish_reason="stop"):
+    """Plain-attribute stand-in for a chat.completions response."""
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content), finish_reason=finish_reason)],
+        model=model,
+        id="test-id",
+        created=1234567890,
+        usage=_fake_usage(),
+    )
+
 
-    def setup_method(self):
-        """Set up clean state before each test."""
-        # Clear restriction service cache before each test
-        import utils.model_restrictions
+def _fake_responses_response(text, model):
+    """Plain-attribute stand-in for a /v1/responses response."""
+    return SimpleNamespace(
+        output=SimpleNamespace(content=[SimpleNamespace(type="output_text", text=text)]),
+        model=model,
+        id="test-id",
+        created_at=1234567890,
+        usage=_fake_usage(),
+    )
 
-        utils.model_restrictions._restriction_service = None
 
-    def teardown_method(self):
-        """Clean up after each test to avoid singleton issues."""
-        # Clear restriction service cache after each test
-        import utils.model_restrictions
+@pytest.fixture(scope="class")
+def provider():
+    """Provider shared by tests that only read model metadata.
 
-        utils.model_restrictions._restriction_service = None
+    Tests that call generate_content() build their own, since the provider
+    caches the OpenAI client created under each test's patch.
+    """
+    return OpenAIModelProvider("test-key")
+
+
+@pytest.fixture
+def mock_openai_client():
+    """Patch the OpenAI class and yield the client instance it hands out."""
+    with patch("providers.openai_provider.OpenAI") as mock_openai_class:
+        mock_client = MagicMock(spec=OpenAI)
+        mock_openai_class.return_value = mock_client
+        yield mock_client
+
+
+class TestOpenAIProvider:
+    """Test OpenAI provider functionality."""
+
+    @pytest.fixture(autouse=True)
+    def _reset_restrictions(self, monkeypatch):
+        """Start each test with no cached restriction service; monkeypatch restores it afterwards."""
+        monkeypatch.setattr(utils.model_restrictions, "_restriction_service", None)
 
     @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"})
     def test_initialization(self):
@@ -38,10 +79,8 @@ class TestOpenAIProvider:
         assert provider.api_key == "test-key"
         assert provider.base_url == "https://custom.openai.com/v1"
 
-    def test_model_validation(self):
+    def test_model_validation(self, provider):
         """Test model name validation."""
-        provider = OpenAIModelProvider("test-key")
-
         # Test valid models
         assert provider.validate_model_name("o3") is True
         assert provider.validate_model_name("o3-pro") is True
@@ -56,10 +95,8 @@ class TestOpenAIProvider:
         assert provider.validate_model_name("gpt-4") is False
         assert provider.validate_model_name("gemini-pro") is False
 
-    def test_resolve_model_name(self):
+    def test_resolve_model_name(self, provider):
         """Test model name resolution."""
-        provider = OpenAIModelProvider("test-key")
-
         # Test shorthand resolution
         assert provider._resolve_model_name("pro") == "gemini-2.5-pro"
         assert provider._resolve_model_name("flash") == "gemini-2.5-flash"
@@ -68,10 +105,35 @@ class TestOpenAIProvider:
         assert provider._resolve_model_name("o3") == "o3"
         assert provider._resolve_model_name("o3-pro") == "o3-pro-2025-06-10"
 
-    def test_get_capabilities_o3(self):
-        """Test getting model capabilities for O3."""
+    def test_resolve_model_name_is_memoized(self):
+        """Test that each known name is only scanned against the alias table once."""
+        provider = OpenAIModelProvider("test-key")
+
+        with patch.object(provider, "get_all_model_aliases", wraps=provider.get_all_model_aliases) as mock_aliases:
+            assert provider._resolve_model_name("flash") == "gemini-2.5-flash"
+            assert provider._resolve_model_name("FLASH") == "gemini-2.5-flash"
+            assert mock_aliases.call_count == 1
+
+            # Unknown names pass through and are not cached, so the cache stays bounded
+            assert provider._resolve_model_name("unknown-model") == "unknown-model"
+            assert provider._resolve_model_name("unknown-model") == "unknown-model"
+            assert mock_aliases.call_count == 3
+
+        assert provider._resolve_cache == {"flash": "gemini-2.5-flash"}
+
+    def test_validate_model_name_rejects_unknown_without_resolving(self):
+        """Test that names outside the known model/alias set are rejected before resolution."""
         provider = OpenAIModelProvider("test-key")
 
+        with patch.object(provider, "_resolve_model_name", wraps=provider._resolve_model_name) as mock_resolve:
+            assert provider.validate_model_name("not-a-model") is False
+            mock_resolve.assert_not_called()
+
+            assert provider.validate_model_name("FLASH") is True
+            mock_resolve.assert_called_once_with("FLASH")
+
+    def test_get_capabilities_o3(self, provider):
+        """Test getting model capabilities for O3."""
         capabilities = provider.get_capabilities("o3")
         assert capabilities.model_name == "o3"  # Should NOT be resolved in capabilities
         assert capabilities.friendly_name == "OpenAI (O3)"
@@ -85,148 +147,75 @@ class TestOpenAIProvider:
         # Test temperature constraint (O3 has fixed temperature)
         assert capabilities.temperature_constraint.value == 1.0
 
-    def test_get_capabilities_with_alias(self):
+    def test_get_capabilities_with_alias(self, provider):
         """Test getting model capabilities with alias resolves correctly."""
-        provider = OpenAIModelProvider("test-key")
-
         capabilities = provider.get_capabilities("pro")
         assert capabilities.model_name == "gemini-2.5-pro"  # Capabilities should show resolved model name
         assert capabilities.friendly_name == "Gemini (Pro 2.5)"
         assert capabilities.context_window == 1_048_576
         assert capabilities.provider == ProviderType.OPENAI
 
-    @patch("providers.openai_compatible.OpenAI")
-    def test_generate_content_resolves_alias_before_api_call(self, mock_openai_class):
+    @pytest.mark.parametrize(
+        "model_input, expected_api_model, expected_temperature",
+        [
+            ("pro", "gemini-2.5-pro", 1.0),
+            ("gemini-pro", "gemini-2.5-pro", 1.0),
+            ("flash", "gemini-2.5-flash", 1.0),
+            ("flash2.5", "gemini-2.5-flash", 1.0),
+            # Full names pass through unchanged (o3 rather than o3-pro, which uses the responses endpoint)
+            ("o3", "o3", None),
+        ],
+    )
+    def test_generate_content_resolves_alias_before_api_call(
+        self, mock_openai_client, model_input, expected_api_model, expected_temperature
+    ):
         """Test that generate_content resolves aliases before making API calls.
 
         This is the CRITICAL test that was missing - verifying that aliases
         like 'pro' get resolved to 'gemini-2.5-pro' before being sent to OpenAI API.
         """
-        # Set up mock OpenAI client
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
-
-        # Mock the completion response
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock()]
-        mock_response.choices[0].message.content = "Test response"
-        mock_response.choices[0].finish_reason = "stop"
-        mock_response.model = "gemini-2.5-pro"  # API returns the resolved model name
-        mock_response.id = "test-id"
-        mock_response.created = 1234567890
-        mock_response.usage = MagicMock()
-        mock_response.usage.prompt_tokens = 10
-        mock_response.usage.completion_tokens = 5
-        mock_response.usage.total_tokens = 15
-
-        mock_client.chat.completions.create.return_value = mock_response
+        # Mock the completion response (API returns the resolved model name)
+        mock_openai_client.chat.completions.create.return_value = _fake_chat_response(model=expected_api_model)
 
         provider = OpenAIModelProvider("test-key")
 
-        # Call generate_content with alias 'pro' (resolves to gemini-2.5-pro, supports temperature)
-        result = provider.generate_content(
-            prompt="Test prompt",
-            model_name="pro",
-            temperature=1.0,  # This should be resolved to "gemini-2.5-pro"
-        )
+        result = provider.generate_content(prompt="Test prompt", model_name=model_input, temperature=1.0)
 
         # Verify the API was called with the RESOLVED model name
-        mock_client.chat.completions.create.assert_called_once()
-        call_kwargs = mock_client.chat.completions.create.call_args[1]
+        mock_openai_client.chat.completions.create.assert_called_once()
+        call_kwargs = mock_openai_client.chat.completions.create.call_args[1]
 
-        # CRITICAL ASSERTION: The API should receive "gemini-2.5-pro", not "pro"
+        # CRITICAL ASSERTION: The API should receive the resolved name, not the alias
         assert (
-            call_kwargs["model"] == "gemini-2.5-pro"
-        ), f"Expected 'gemini-2.5-pro' but API received '{call_kwargs['model']}'"
+            call_kwargs["model"] == expected_api_model
+        ), f"Expected '{expected_api_model}' but API received '{call_kwargs['model']}'"
 
-        # Verify other parameters (gemini-2.5-pro supports temperature)
-        assert call_kwargs["temperature"] == 1.0
+        # Verify other parameters (O3 models don't accept temperature)
+        assert call_kwargs.get("temperature") == expected_temperature
         assert len(call_kwargs["messages"]) == 1
         assert call_kwargs["messages"][0]["role"] == "user"
         assert call_kwargs["messages"][0]["content"] == "Test prompt"
 
         # Verify response
         assert result.content == "Test response"
-        assert result.model_name == "gemini-2.5-pro"  # Should be the resolved name
-
-    @patch("providers.openai_compatible.OpenAI")
-    def test_generate_content_other_aliases(self, mock_openai_class):
-        """Test other alias resolutions in generate_content."""
-        # Set up mock
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock()]
-        mock_response.choices[0].message.content = "Test response"
-        mock_response.choices[0].finish_reason = "stop"
-        mock_response.usage = MagicMock()
-        mock_response.usage.prompt_tokens = 10
-        mock_response.usage.completion_tokens = 5
-        mock_response.usage.total_tokens = 15
-        mock_client.chat.completions.create.return_value = mock_response
+        assert result.model_name == expected_api_model  # Should be the resolved name
+        assert result.metadata["model"] == expected_api_model  # Actual model used by the API
 
-        provider = OpenAIModelProvider("test-key")
-
-        # Test flash -> gemini-2.5-flash
-        mock_response.model = "gemini-2.5-flash"
-        provider.generate_content(prompt="Test", model_name="flash", temperature=1.0)
-        call_kwargs = mock_client.chat.completions.create.call_args[1]
-        assert call_kwargs["model"] == "gemini-2.5-flash"
-
-    @patch("providers.openai_compatible.OpenAI")
-    def test_generate_content_no_alias_passthrough(self, mock_openai_class):
-        """Test that full model names pass through unchanged."""
-        # Set up mock
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock()]
-        mock_response.choices[0].message.content = "Test response"
-        mock_response.choices[0].finish_reason = "stop"
-        mock_response.model = "o3"
-        mock_response.usage = MagicMock()
-        mock_response.usage.prompt_tokens = 10
-        mock_response.usage.completion_tokens = 5
-        mock_response.usage.total_tokens = 15
-        mock_client.chat.completions.create.return_value = mock_response
-
-        provider = OpenAIModelProvider("test-key")
-
-        # Test full model name passes through unchanged (use o3 since o3-pro has special handling)
-        provider.generate_content(prompt="Test", model_name="o3", temperature=1.0)
-        call_kwargs = mock_client.chat.completions.create.call_args[1]
-        assert call_kwargs["model"] == "o3"  # Should be unchanged
-
-    def test_supports_thinking_mode(self):
+    def test_supports_thinking_mode(self, provider):
         """Test thinking mode support (currently False for all OpenAI models)."""
-        provider = OpenAIModelProvider("test-key")
-
         # All OpenAI models currently don't support thinking mode
         assert provider.supports_thinking_mode("o3") is False
         assert provider.supports_thinking_mode("o3-pro") is False
         assert provider.supports_thinking_mode("pro") is False  # Test with alias too
 
-    @patch("providers.openai_compatible.OpenAI")
+    @patch("providers.openai_provider.OpenAI")
     def test_o3_pro_routes_to_responses_endpoint(self, mock_openai_class):
         """Test that o3-pro model routes to the /v1/responses endpoint (mock test)."""
         # Set up mock for OpenAI client responses endpoint
-        mock_client = MagicMock()
+        mock_client = MagicMock(spec=OpenAI)
         mock_openai_class.return_value = mock_client
 
-        mock_response = MagicMock()
-        mock_response.output = MagicMock()
-        mock_response.output.content = [MagicMock()]
-        mock_response.output.content[0].type = "output_text"
-        mock_response.output.content[0].text = "4"
-        mock_response.model = "o3-pro-2025-06-10"
-        mock_response.id = "test-id"
-        mock_response.created_at = 1234567890
-        mock_response.usage = MagicMock()
-        mock_response.usage.prompt_tokens = 10
-        mock_response.usage.completion_tokens = 5
-        mock_response.usage.total_tokens = 15
-
-        mock_client.responses.create.return_value = mock_response
+        mock_client.responses.create.return_value = _fake_responses_response("4", model="o3-pro-2025-06-10")
 
         provider = OpenAIModelProvider("test-key")
 
@@ -245,24 +234,13 @@ class TestOpenAIProvider:
         assert result.model_name == "o3-pro-2025-06-10"
         assert result.metadata["endpoint"] == "responses"
 
-    @patch("providers.openai_compatible.OpenAI")
+    @patch("providers.openai_provider.OpenAI")
     def test_non_o3_pro_uses_chat_completions(self, mock_openai_class):
         """Test that non-o3-pro models use the standard chat completions endpoint."""
         # Set up mock
-        mock_client = MagicMock()
+        mock_client = MagicMock(spec=OpenAI)
         mock_openai_class.return_value = mock_client
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock()]
-        mock_response.choices[0].message.content = "Test response"
-        mock_response.choices[0].finish_reason = "stop"
-        mock_response.model = "o3"
-        mock_response.id = "test-id"
-        mock_response.created = 1234567890
-        mock_response.usage = MagicMock()
-        mock_response.usage.prompt_tokens = 10
-        mock_response.usage.completion_tokens = 5
-        mock_response.usage.total_tokens = 15
-        mock_client.chat.completions.create.return_value = mock_response
+        mock_client.chat.completions.create.return_value = _fake_chat_response(model="o3")
 
         provider = OpenAIModelProvider("test-key")
 
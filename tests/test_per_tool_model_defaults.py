@@ -151,6 +151,15 @@ class TestModelSelection:
             # Should pick a reasonable default, preferring flash for balanced use
             assert "flash" in model or model == "gemini-2.5-flash"
 
+    def test_fallback_table_is_keyed_by_category(self):
+        """Test that fallback rows are keyed by ToolModelCategory members, not their values."""
+        table = ModelProviderRegistry._get_fallback_table()
+
+        assert set(table) <= set(ToolModelCategory) | {None}
+        assert ToolModelCategory.EXTENDED_REASONING in table
+        assert ToolModelCategory.FAST_RESPONSE in table
+        assert None in table
+
 
 class TestFlexibleModelSelection:
     """Test that model selection handles various naming scenarios."""
@@ -229,7 +238,7 @@ class TestAutoModeErrorMessages:
     def teardown_method(self):
         """Clean up after each test to prevent state pollution."""
         # Clear provider registry singleton
-        ModelProviderRegistry._instance = None
+        ModelProviderRegistry.reset_for_testing()
 
     @pytest.mark.asyncio
     async def test_chat_auto_error_message(self):
@@ -341,7 +350,7 @@ class TestRuntimeModelSelection:
     def teardown_method(self):
         """Clean up after each test to prevent state pollution."""
         # Clear provider registry singleton
-        ModelProviderRegistry._instance = None
+        ModelProviderRegistry.reset_for_testing()
 
     @pytest.mark.asyncio
     async def test_explicit_auto_in_request(self):
@@ -0,0 +1,291 @@
+"""
+Tests for ModelProviderRegistry caching and provider initialization.
+
+These tests ensure that cached model listings and lookups are reused between
+calls, are invalidated whenever the set of registered providers changes, and
+that provider instances are only built once.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+from providers.base import ProviderType
+from providers.registry import ModelProviderRegistry
+
+
+class TestAvailableModelsCache:
+    """Test caching of get_available_models()"""
+
+    def setup_method(self):
+        """Start each test with an empty registry"""
+        ModelProviderRegistry.reset_for_testing()
+
+    def teardown_method(self):
+        """Leave a clean registry behind for other tests"""
+        ModelProviderRegistry.reset_for_testing()
+
+    def _register_mock_provider(self, models):
+        """Register a mock OpenAI provider whose list_models() returns the given models"""
+        provider = MagicMock()
+        provider.list_models.return_value = models
+        ModelProviderRegistry.register_provider(ProviderType.OPENAI, MagicMock(return_value=provider))
+        ModelProviderRegistry._initialized_providers[ProviderType.OPENAI] = provider
+        return provider
+
+    def test_repeated_calls_reuse_cached_listing(self):
+        """Test that list_models() is only called once for repeated lookups"""
+        provider = self._register_mock_provider(["o3", "gpt-4o"])
+
+        first = ModelProviderRegistry.get_available_models(respect_restrictions=True)
+        second = ModelProviderRegistry.get_available_models(respect_restrictions=True)
+
+        assert first == second == {"o3": ProviderType.OPENAI, "gpt-4o": ProviderType.OPENAI}
+        assert provider.list_models.call_count == 1
+
+    def test_cache_is_keyed_by_respect_restrictions(self):
+        """Test that restricted and unrestricted listings are cached separately"""
+        provider = self._register_mock_provider(["o3"])
+
+        ModelProviderRegistry.get_available_models(respect_restrictions=True)
+        ModelProviderRegistry.get_available_models(respect_restrictions=False)
+
+        assert provider.list_models.call_count == 2
+
+    def test_returned_dict_mutation_does_not_poison_cache(self):
+        """Test that callers mutating the result do not affect later calls"""
+        self._register_mock_provider(["o3"])
+
+        models = ModelProviderRegistry.get_available_models()
+        models["bogus"] = ProviderType.OPENAI
+
+        assert "bogus" not in ModelProviderRegistry.get_available_models()
+
+    def test_unregister_invalidates_cache(self):
+        """Test that unregistering a provider drops its models from the listing"""
+        self._register_mock_provider(["o3"])
+        assert "o3" in ModelProviderRegistry.get_available_models()
+
+        ModelProviderRegistry.unregister_provider(ProviderType.OPENAI)
+
+        assert ModelProviderRegistry.get_available_models() == {}
+
+    def test_clear_cache_invalidates_listing(self):
+        """Test that clear_cache() forces list_models() to be called again"""
+        provider = self._register_mock_provider(["o3"])
+        ModelProviderRegistry.get_available_models()
+
+        ModelProviderRegistry.clear_cache()
+        ModelProviderRegistry._initialized_providers[ProviderType.OPENAI] = provider
+        ModelProviderRegistry.get_available_models()
+
+        assert provider.list_models.call_count == 2
+
+    def test_model_names_for_provider_use_inverse_index(self):
+        """Test that filtering by provider reads the cached provider-to-models index"""
+        self._register_mock_provider(["o3", "gpt-4o", "o3"])
+
+        with patch.object(ModelProviderRegistry, "get_available_models") as mock_get_available:
+            names = ModelProviderRegistry.get_available_model_names(ProviderType.OPENAI)
+
+        assert names == ["o3", "gpt-4o"]
+        mock_get_available.assert_not_called()
+
+    def test_model_names_survive_concurrent_invalidation(self):
+        """Test that a cache invalidation right after the build doesn't break the per-provider lookup"""
+        self._register_mock_provider(["o3", "gpt-4o"])
+        build = ModelProviderRegistry._cached_available_models
+
+        def build_then_invalidate(respect_restrictions):
+            # Another thread constructing a provider invalidates the caches at this point
+            result = build(respect_restrictions)
+            ModelProviderRegistry._invalidate_model_caches()
+            return result
+
+        with patch.object(ModelProviderRegistry, "_cached_available_models", side_effect=build_then_invalidate):
+            names = ModelProviderRegistry.get_available_model_names(ProviderType.OPENAI)
+
+        assert names == ["o3", "gpt-4o"]
+
+
+class TestProviderForModelCache:
+    """Test memoization of get_provider_for_model()"""
+
+    def setup_method(self):
+        """Start each test with an empty registry"""
+        ModelProviderRegistry.reset_for_testing()
+
+    def teardown_method(self):
+        """Leave a clean registry behind for other tests"""
+        ModelProviderRegistry.reset_for_testing()
+
+    def test_model_lookup_is_memoized(self):
+        """Test that validate_model_name() runs once per model name"""
+        provider = MagicMock()
+        provider.validate_model_name.return_value = True
+        ModelProviderRegistry.register_provider(ProviderType.OPENAI, MagicMock(return_value=provider))
+        ModelProviderRegistry._initialized_providers[ProviderType.OPENAI] = provider
+
+        assert ModelProviderRegistry.get_provider_for_model("o3") is provider
+        assert ModelProviderRegistry.get_provider_for_model("o3") is provider
+        assert provider.validate_model_name.call_count == 1
+
+    def test_cache_hit_skips_restriction_service_lookup(self):
+        """Test that memoized lookups don't call get_restriction_service() until it is reset"""
+        import utils.model_restrictions
+
+        provider = MagicMock()
+        provider.validate_model_name.return_value = True
+        ModelProviderRegistry.register_provider(ProviderType.OPENAI, MagicMock(return_value=provider))
+        ModelProviderRegistry._initialized_providers[ProviderType.OPENAI] = provider
+        ModelProviderRegistry.get_provider_for_model("o3")
+
+        with patch.object(
+            utils.model_restrictions, "get_restriction_service", wraps=utils.model_restrictions.get_restriction_service
+        ) as mock_get_service:
+            # Swapping the getter is itself detected once, then the fast path takes over
+            ModelProviderRegistry.get_provider_for_model("o3")
+            ModelProviderRegistry.get_provider_for_model("o3")
+            assert mock_get_service.call_count == 1
+
+            utils.model_restrictions._restriction_service = None
+            ModelProviderRegistry.get_provider_for_model("o3")
+            assert mock_get_service.call_count == 2
+            assert provider.validate_model_name.call_count == 2
+
+    def test_unknown_models_are_not_cached(self):
+        """Test that failed lookups are not stored, so arbitrary names can't grow the cache"""
+        provider = MagicMock()
+        provider.validate_model_name.return_value = False
+        ModelProviderRegistry.register_provider(ProviderType.OPENAI, MagicMock(return_value=provider))
+        ModelProviderRegistry._initialized_providers[ProviderType.OPENAI] = provider
+
+        assert ModelProviderRegistry.get_provider_for_model("no-such-model") is None
+        assert ModelProviderRegistry.get_provider_for_model("no-such-model") is None
+
+        assert ModelProviderRegistry._model_provider_cache == {}
+        assert provider.validate_model_name.call_count == 2
+
+    def test_register_provider_invalidates_lookup(self):
+        """Test that re-registering a provider forgets cached lookups"""
+        provider = MagicMock()
+        provider.validate_model_name.return_value = False
+        ModelProviderRegistry.register_provider(ProviderType.OPENAI, MagicMock(return_value=provider))
+        ModelProviderRegistry._initialized_providers[ProviderType.OPENAI] = provider
+        assert ModelProviderRegistry.get_provider_for_model("o3") is None
+
+        provider.validate_model_name.return_value = True
+        ModelProviderRegistry.register_provider(ProviderType.OPENAI, MagicMock(return_value=provider))
+        ModelProviderRegistry._initialized_providers[ProviderType.OPENAI] = provider
+
+        assert ModelProviderRegistry.get_provider_for_model("o3") is provider
+
+    def test_reregistering_same_class_keeps_caches(self):
+        """Test that registering the same provider class again is a no-op"""
+        provider = MagicMock()
+        provider.validate_model_name.return_value = True
+        provider_class = MagicMock(return_value=provider)
+        ModelProviderRegistry.register_provider(ProviderType.OPENAI, provider_class)
+        ModelProviderRegistry._initialized_providers[ProviderType.OPENAI] = provider
+        ModelProviderRegistry.get_provider_for_model("o3")
+
+        ModelProviderRegistry.register_provider(ProviderType.OPENAI, provider_class)
+
+        assert ModelProviderRegistry._initialized_providers[ProviderType.OPENAI] is provider
+        assert ModelProviderRegistry.get_provider_for_model("o3") is provider
+        assert provider.validate_model_name.call_count == 1
+
+    def test_registering_new_class_drops_old_instance(self):
+        """Test that replacing a provider class discards the instance built from the old one"""
+        old_provider = MagicMock()
+        ModelProviderRegistry.register_provider(ProviderType.OPENAI, MagicMock(return_value=old_provider))
+        ModelProviderRegistry._initialized_providers[ProviderType.OPENAI] = old_provider
+
+        ModelProviderRegistry.register_provider(ProviderType.OPENAI, MagicMock())
+
+        assert ProviderType.OPENAI not in ModelProviderRegistry._initialized_providers
+
+    def test_capabilities_are_memoized_per_provider(self):
+        """Test that capabilities are reused for the same provider and refetched for a new one"""
+        provider = MagicMock()
+        assert ModelProviderRegistry.get_model_capabilities("o3", provider) is provider.get_capabilities.return_value
+        ModelProviderRegistry.get_model_capabilities("o3", provider)
+        provider.get_capabilities.assert_called_once_with("o3")
+
+        other_provider = MagicMock()
+        assert (
+            ModelProviderRegistry.get_model_capabilities("o3", other_provider)
+            is other_provider.get_capabilities.return_value
+        )
+
+        ModelProviderRegistry.reset_for_testing()
+        ModelProviderRegistry.get_model_capabilities("o3", other_provider)
+        assert other_provider.get_capabilities.call_count == 2
+
+
+class TestProviderInitialization:
+    """Test thread-safe provider initialization"""
+
+    def setup_method(self):
+        """Start each test with an empty registry"""
+        ModelProviderRegistry.reset_for_testing()
+
+    def teardown_method(self):
+        """Leave a clean registry behind for other tests"""
+        ModelProviderRegistry.reset_for_testing()
+
+    @patch.dict("os.environ", {"OPENAI_API_KEY": "test-key"})
+    def test_concurrent_get_provider_builds_one_instance(self):
+        """Test that concurrent callers share a single provider instance"""
+        barrier = threading.Barrier(8)
+        constructed = []
+
+        def slow_factory(api_key=None):
+            time.sleep(0.01)
+            provider = MagicMock()
+            constructed.append(provider)
+            return provider
+
+        ModelProviderRegistry.register_provider(ProviderType.OPENAI, slow_factory)
+
+        def worker():
+            barrier.wait()
+            return ModelProviderRegistry.get_provider(ProviderType.OPENAI)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = [f.result() for f in [executor.submit(worker) for _ in range(8)]]
+
+        assert len(constructed) == 1
+        assert all(result is constructed[0] for result in results)
+
+    @patch.dict("os.environ", {"OPENAI_API_KEY": "test-key"})
+    def test_only_first_construction_invalidates_caches(self):
+        """Test that a forced rebuild of an already-listed provider keeps cached listings"""
+        ModelProviderRegistry.register_provider(ProviderType.OPENAI, MagicMock())
+        version = ModelProviderRegistry.configuration_version()
+
+        ModelProviderRegistry.get_provider(ProviderType.OPENAI)
+        assert ModelProviderRegistry.configuration_version() == version + 1
+
+        ModelProviderRegistry.get_provider(ProviderType.OPENAI, force_new=True)
+        assert ModelProviderRegistry.configuration_version() == version + 1
+
+    @patch.dict("os.environ", {"OPENAI_API_KEY": "test-key"})
+    def test_providers_with_keys_does_not_instantiate(self):
+        """Test that checking for API keys never constructs a provider"""
+        factory = MagicMock()
+        ModelProviderRegistry.register_provider(ProviderType.OPENAI, factory)
+
+        assert ModelProviderRegistry.get_available_providers_with_keys() == [ProviderType.OPENAI]
+        factory.assert_not_called()
+
+    def test_reset_for_testing_registers_providers_from_env(self):
+        """Test that reset_for_testing(env=...) registers providers whose key is set"""
+        from providers.openai_provider import OpenAIModelProvider
+
+        ModelProviderRegistry.reset_for_testing(env={"OPENAI_API_KEY": "test-key"})
+        assert ModelProviderRegistry._providers == {ProviderType.OPENAI: OpenAIModelProvider}
+
+        ModelProviderRegistry.reset_for_testing(env={})
+        assert ModelProviderRegistry._providers == {}
@@ -64,7 +64,7 @@ class TestThinkingModes:
             importlib.reload(config)
             from providers.registry import ModelProviderRegistry
 
-            ModelProviderRegistry._instance = None
+            ModelProviderRegistry.reset_for_testing()
 
             tool = AnalyzeTool()
 
@@ -108,7 +108,7 @@ class TestThinkingModes:
 
             # Reload config and clear registry
             importlib.reload(config)
-            ModelProviderRegistry._instance = None
+            ModelProviderRegistry.reset_for_testing()
 
     @pytest.mark.asyncio
     async def test_thinking_mode_low(self):
@@ -137,7 +137,7 @@ class TestThinkingModes:
             importlib.reload(config)
             from providers.registry import ModelProviderRegistry
 
-            ModelProviderRegistry._instance = None
+            ModelProviderRegistry.reset_for_testing()
 
             tool = CodeReviewTool()
 
@@ -177,7 +177,7 @@ class TestThinkingModes:
 
             # Reload config and clear registry
             importlib.reload(config)
-            ModelProviderRegistry._instance = None
+            ModelProviderRegistry.reset_for_testing()
 
     @pytest.mark.asyncio
     async def test_thinking_mode_medium(self):
@@ -206,7 +206,7 @@ class TestThinkingModes:
             importlib.reload(config)
             from providers.registry import ModelProviderRegistry
 
-            ModelProviderRegistry._instance = None
+            ModelProviderRegistry.reset_for_testing()
 
             tool = DebugIssueTool()
 
@@ -247,7 +247,7 @@ class TestThinkingModes:
 
             # Reload config and clear registry
             importlib.reload(config)
-            ModelProviderRegistry._instance = None
+            ModelProviderRegistry.reset_for_testing()
 
     @pytest.mark.asyncio
     async def test_thinking_mode_high(self):
@@ -276,7 +276,7 @@ class TestThinkingModes:
             importlib.reload(config)
             from providers.registry import ModelProviderRegistry
 
-            ModelProviderRegistry._instance = None
+            ModelProviderRegistry.reset_for_testing()
 
             tool = AnalyzeTool()
 
@@ -316,7 +316,7 @@ class TestThinkingModes:
 
             # Reload config and clear registry
             importlib.reload(config)
-            ModelProviderRegistry._instance = None
+            ModelProviderRegistry.reset_for_testing()
 
     @pytest.mark.asyncio
     async def test_thinking_mode_max(self):
@@ -347,7 +347,7 @@ class TestThinkingModes:
             importlib.reload(config)
             from providers.registry import ModelProviderRegistry
 
-            ModelProviderRegistry._instance = None
+            ModelProviderRegistry.reset_for_testing()
 
             tool = ThinkDeepTool()
 
@@ -388,7 +388,7 @@ class TestThinkingModes:
 
             # Reload config and clear registry
             importlib.reload(config)
-            ModelProviderRegistry._instance = None
+            ModelProviderRegistry.reset_for_testing()
 
     def test_thinking_budget_mapping(self):
         """Test that thinking modes map to correct budget values"""
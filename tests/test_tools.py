@@ -61,7 +61,7 @@ class TestThinkDeepTool:
             importlib.reload(config)
             from providers.registry import ModelProviderRegistry
 
-            ModelProviderRegistry._instance = None
+            ModelProviderRegistry.reset_for_testing()
 
             # Test with real provider resolution
             try:
@@ -107,7 +107,7 @@ class TestThinkDeepTool:
 
             # Reload config and clear registry
             importlib.reload(config)
-            ModelProviderRegistry._instance = None
+            ModelProviderRegistry.reset_for_testing()
 
 
 class TestCodeReviewTool:
@@ -159,7 +159,7 @@ class TestCodeReviewTool:
             importlib.reload(config)
             from providers.registry import ModelProviderRegistry
 
-            ModelProviderRegistry._instance = None
+            ModelProviderRegistry.reset_for_testing()
 
             # Test with real provider resolution - expect it to fail at API level
             try:
@@ -200,7 +200,7 @@ class TestCodeReviewTool:
 
             # Reload config and clear registry
             importlib.reload(config)
-            ModelProviderRegistry._instance = None
+            ModelProviderRegistry.reset_for_testing()
 
 
 class TestAnalyzeTool:
@@ -261,7 +261,7 @@ class TestAnalyzeTool:
             importlib.reload(config)
             from providers.registry import ModelProviderRegistry
 
-            ModelProviderRegistry._instance = None
+            ModelProviderRegistry.reset_for_testing()
 
             # Test with real provider resolution - expect it to fail at API level
             try:
@@ -304,7 +304,7 @@ class TestAnalyzeTool:
 
             # Reload config and clear registry
             importlib.reload(config)
-            ModelProviderRegistry._instance = None
+            ModelProviderRegistry.reset_for_testing()
 
 
 class TestAbsolutePathValidation:
@@ -385,7 +385,7 @@ class TestAbsolutePathValidation:
             importlib.reload(config)
             from providers.registry import ModelProviderRegistry
 
-            ModelProviderRegistry._instance = None
+            ModelProviderRegistry.reset_for_testing()
 
             # Test with real provider resolution - expect it to fail at API level
             try:
@@ -426,7 +426,7 @@ class TestAbsolutePathValidation:
 
             # Reload config and clear registry
             importlib.reload(config)
-            ModelProviderRegistry._instance = None
+            ModelProviderRegistry.reset_for_testing()
 
 
 class TestSpecialStatusModels:
@@ -29,6 +29,7 @@ class TestWorkflowMetadata:
         registry = ModelProviderRegistry()
         registry._providers.clear()
         registry._initialized_providers.clear()
+        ModelProviderRegistry._invalidate_model_caches()
 
     def teardown_method(self):
         """Clean up after each test."""
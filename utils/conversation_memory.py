@@ -143,6 +143,25 @@ except ValueError:
 
 CONVERSATION_TIMEOUT_SECONDS = CONVERSATION_TIMEOUT_HOURS * 3600
 
+# Maximum number of threads followed through parent_thread_id links
+MAX_THREAD_CHAIN_DEPTH = 20
+
+# Storage format for thread contexts: "json" (default) or "msgpack".
+# MessagePack gives smaller payloads and faster parsing but needs the optional
+# msgpack package; without it we fall back to JSON.
+CONVERSATION_SERIALIZER = os.getenv("CONVERSATION_SERIALIZER", "json").strip().lower()
+if CONVERSATION_SERIALIZER not in ("json", "msgpack"):
+    logger.warning(f"Invalid CONVERSATION_SERIALIZER value ('{CONVERSATION_SERIALIZER}'), using json")
+    CONVERSATION_SERIALIZER = "json"
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+    if CONVERSATION_SERIALIZER == "msgpack":
+        logger.warning("CONVERSATION_SERIALIZER=msgpack but msgpack is not installed, using json")
+        CONVERSATION_SERIALIZER = "json"
+
 
 class ConversationTurn(BaseModel):
     """
@@ -190,10 +209,12 @@ class ThreadContext(BaseModel):
         tool_name: Name of the tool that initiated this thread
         turns: List of all conversation turns in chronological order
         initial_context: Original request data that started the conversation
+        ancestor_thread_ids: Parent, grandparent, ... IDs so the chain can be fetched in one batch
     """
 
     thread_id: str
     parent_thread_id: Optional[str] = None  # Parent thread for conversation chains
+    ancestor_thread_ids: Optional[list[str]] = None  # Nearest ancestor first
     created_at: str
     last_updated_at: str
     tool_name: str  # Tool that created this thread (preserved for attribution)
@@ -201,6 +222,37 @@ class ThreadContext(BaseModel):
     initial_context: dict[str, Any]  # Original request parameters
 
 
+def _serialize(context: ThreadContext):
+    """
+    Serialize a thread context for storage using the configured format.
+
+    JSON goes through pydantic-core's native encoder (model_dump_json) rather
+    than orjson: dumping via model_dump() + orjson.dumps is no faster, because
+    building the intermediate dict costs more than the encoder saves.
+
+    Returns:
+        bytes for MessagePack, str for JSON
+    """
+    if CONVERSATION_SERIALIZER == "msgpack":
+        return msgpack.packb(context.model_dump(mode="json"), use_bin_type=True)
+    return context.model_dump_json()
+
+
+def _deserialize(data) -> ThreadContext:
+    """
+    Deserialize a stored thread context.
+
+    The format is detected from the payload rather than the current setting, so
+    threads written before CONVERSATION_SERIALIZER changed are still readable.
+    A MessagePack map never starts with "{", which every JSON object does.
+    """
+    if isinstance(data, (bytes, bytearray)) and data[:1] != b"{":
+        if msgpack is None:
+            raise ValueError("Stored thread is MessagePack-encoded but msgpack is not installed")
+        return ThreadContext.model_validate(msgpack.unpackb(data, raw=False))
+    return ThreadContext.model_validate_json(data)
+
+
 def get_storage():
     """
     Get in-memory storage backend for conversation persistence.
@@ -234,6 +286,10 @@ def create_thread(tool_name: str, initial_request: dict[str, Any], parent_thread
         - Non-serializable parameters are filtered out automatically
         - Thread can be continued by any tool using the returned UUID
         - Parent thread creates a chain for conversation history traversal
+        - Creating a child thread reads the parent once to copy its recorded
+          ancestry; this one extra read here saves one read per hop every time
+          the chain is fetched later (get_thread_chain is called on each
+          continuation, thread creation only once)
     """
     thread_id = str(uuid.uuid4())
     now = datetime.now(timezone.utc).isoformat()
@@ -245,9 +301,23 @@ def create_thread(tool_name: str, initial_request: dict[str, Any], parent_thread
         if k not in ["temperature", "thinking_mode", "model", "continuation_id"]
     }
 
+    # Record the full ancestry so get_thread_chain() can batch-fetch it later. Only
+    # do so when the parent still exists: an expired parent breaks the chain anyway,
+    # and the sequential walk in _get_ancestors() handles threads without ancestry.
+    # Ancestors of a live parent may still have expired; the batched read stops at
+    # the first missing thread, so a gap only ever shortens the chain.
+    ancestor_thread_ids = None
+    if parent_thread_id:
+        parent = get_thread(parent_thread_id)
+        if parent:
+            ancestor_thread_ids = [parent_thread_id]
+            if parent.ancestor_thread_ids:
+                ancestor_thread_ids.extend(parent.ancestor_thread_ids[: MAX_THREAD_CHAIN_DEPTH - 2])
+
     context = ThreadContext(
         thread_id=thread_id,
         parent_thread_id=parent_thread_id,  # Link to parent for conversation chains
+        ancestor_thread_ids=ancestor_thread_ids,
         created_at=now,
         last_updated_at=now,
         tool_name=tool_name,  # Track which tool initiated this conversation
@@ -258,7 +328,7 @@ def create_thread(tool_name: str, initial_request: dict[str, Any], parent_thread
     # Store in memory with configurable TTL to prevent indefinite accumulation
     storage = get_storage()
     key = f"thread:{thread_id}"
-    storage.setex(key, CONVERSATION_TIMEOUT_SECONDS, context.model_dump_json())
+    storage.setex(key, CONVERSATION_TIMEOUT_SECONDS, _serialize(context))
 
     logger.debug(f"[THREAD] Created new thread {thread_id} with parent {parent_thread_id}")
 
@@ -294,7 +364,7 @@ def get_thread(thread_id: str) -> Optional[ThreadContext]:
         data = storage.get(key)
 
         if data:
-            return ThreadContext.model_validate_json(data)
+            return _deserialize(data)
         return None
     except Exception:
         # Silently handle errors to avoid exposing storage details
@@ -373,37 +443,74 @@ def add_turn(
     context.turns.append(turn)
     context.last_updated_at = datetime.now(timezone.utc).isoformat()
 
-    # Save back to storage and refresh TTL
+    # Save back to storage and refresh TTL. The whole context is rewritten on each turn
+    # rather than appended per turn: threads are capped at MAX_CONVERSATION_TURNS, so the
+    # rewrite is bounded, and a single key keeps get_thread() and batched chain reads to
+    # one value per thread.
     try:
         storage = get_storage()
         key = f"thread:{thread_id}"
-        storage.setex(key, CONVERSATION_TIMEOUT_SECONDS, context.model_dump_json())  # Refresh TTL to configured timeout
+        storage.setex(key, CONVERSATION_TIMEOUT_SECONDS, _serialize(context))  # Refresh TTL to configured timeout
         return True
     except Exception as e:
         logger.debug(f"[FLOW] Failed to save turn to storage: {type(e).__name__}")
         return False
 
 
-def get_thread_chain(thread_id: str, max_depth: int = 20) -> list[ThreadContext]:
+def _get_threads(thread_ids: list[str]) -> list[Optional[ThreadContext]]:
     """
-    Traverse the parent chain to get all threads in conversation sequence.
+    Fetch several threads with a single storage round-trip.
 
-    Retrieves the complete conversation chain by following parent_thread_id
-    links. Returns threads in chronological order (oldest first).
+    Returns one entry per requested ID, None where the thread is missing,
+    expired or invalid. Returns an empty list if the batch read fails, so
+    callers can fall back to fetching threads one at a time.
+    """
+    if not all(_is_valid_uuid(thread_id) for thread_id in thread_ids):
+        return []
 
-    Args:
-        thread_id: Starting thread ID
-        max_depth: Maximum chain depth to prevent infinite loops
+    try:
+        storage = get_storage()
+        payloads = storage.mget([f"thread:{thread_id}" for thread_id in thread_ids])
+        return [_deserialize(data) if data else None for data in payloads]
+    except Exception:
+        # Silently handle errors to avoid exposing storage details
+        return []
 
-    Returns:
-        list[ThreadContext]: All threads in chain, oldest first
+
+def _get_ancestors(context: ThreadContext, max_depth: int) -> list[ThreadContext]:
+    """
+    Follow parent links from a thread, returning its ancestors nearest first.
+
+    Threads that recorded their ancestry are fetched in one batch; the walk
+    then continues one get_thread() at a time for threads created before
+    ancestor_thread_ids existed, or if a batched link doesn't check out.
+
+    Args:
+        context: Thread whose ancestors to fetch (not included in the result)
+        max_depth: Maximum number of ancestors to return
     """
-    chain = []
-    current_id = thread_id
-    seen_ids = set()
+    if max_depth <= 0:
+        return []
 
-    # Build chain from current to oldest
-    while current_id and len(chain) < max_depth:
+    ancestors = []
+    seen_ids = {context.thread_id}
+    current = context
+
+    if context.ancestor_thread_ids and context.ancestor_thread_ids[0] == context.parent_thread_id:
+        expected_ids = context.ancestor_thread_ids[: max(max_depth, 0)]
+        for expected_id, ancestor in zip(expected_ids, _get_threads(expected_ids)):
+            # Stop at the first gap; the sequential walk below picks up from there
+            if ancestor is None or ancestor.thread_id != expected_id or current.parent_thread_id != expected_id:
+                break
+            if expected_id in seen_ids:
+                logger.warning(f"[THREAD] Circular reference detected in thread chain at {expected_id}")
+                return ancestors
+            seen_ids.add(expected_id)
+            ancestors.append(ancestor)
+            current = ancestor
+
+    current_id = current.parent_thread_id
+    while current_id and len(ancestors) < max_depth:
         # Prevent circular references
         if current_id in seen_ids:
             logger.warning(f"[THREAD] Circular reference detected in thread chain at {current_id}")
@@ -411,13 +518,41 @@ def get_thread_chain(thread_id: str, max_depth: int = 20) -> list[ThreadContext]
 
         seen_ids.add(current_id)
 
-        context = get_thread(current_id)
-        if not context:
+        ancestor = get_thread(current_id)
+        if not ancestor:
             logger.debug(f"[THREAD] Thread {current_id} not found in chain traversal")
             break
 
-        chain.append(context)
-        current_id = context.parent_thread_id
+        ancestors.append(ancestor)
+        current_id = ancestor.parent_thread_id
+
+    return ancestors
+
+
+def get_thread_chain(thread_id: str, max_depth: int = MAX_THREAD_CHAIN_DEPTH) -> list[ThreadContext]:
+    """
+    Traverse the parent chain to get all threads in conversation sequence.
+
+    Retrieves the complete conversation chain by following parent_thread_id
+    links. Returns threads in chronological order (oldest first). Ancestors
+    recorded in ancestor_thread_ids are fetched with a single batched read.
+
+    Args:
+        thread_id: Starting thread ID
+        max_depth: Maximum chain depth to prevent infinite loops
+
+    Returns:
+        list[ThreadContext]: All threads in chain, oldest first
+    """
+    if max_depth <= 0:
+        return []
+
+    context = get_thread(thread_id)
+    if not context:
+        logger.debug(f"[THREAD] Thread {thread_id} not found in chain traversal")
+        return []
+
+    chain = [context] + _get_ancestors(context, max_depth - 1)
 
     # Reverse to get chronological order (oldest first)
     chain.reverse()
@@ -537,39 +672,62 @@ def get_conversation_image_list(context: ThreadContext) -> list[str]:
     Performance:
         - Time Complexity: O(n*m) where n=turns, m=avg images per turn
         - Space Complexity: O(i) where i=total unique images
-        - Uses set for O(1) duplicate detection
+        - Uses an insertion-ordered dict for O(1) duplicate detection and ordering
     """
     if not context.turns:
         logger.debug("[IMAGES] No turns found, returning empty image list")
         return []
 
-    # Collect images by walking backwards (newest to oldest turns)
-    seen_images = set()
-    image_list = []
-
     logger.debug(f"[IMAGES] Collecting images from {len(context.turns)} turns (newest first)")
 
-    # Process turns in reverse order (newest first) - this is the CORE of newest-first prioritization
-    # By iterating from len-1 down to 0, we encounter newer turns before older turns
-    # When we find a duplicate image, we skip it because the newer version is already in our list
-    for i in range(len(context.turns) - 1, -1, -1):  # REVERSE: newest turn first
-        turn = context.turns[i]
+    # Walk turns newest-first; the insertion-ordered dict keeps the first (newest)
+    # reference to each image and silently ignores older duplicates
+    seen_images: dict[str, None] = {}
+    for turn in reversed(context.turns):
         if turn.images:
-            logger.debug(f"[IMAGES] Turn {i + 1} has {len(turn.images)} images: {turn.images}")
             for image_path in turn.images:
-                if image_path not in seen_images:
-                    # First time seeing this image - add it (this is the NEWEST reference)
-                    seen_images.add(image_path)
-                    image_list.append(image_path)
-                    logger.debug(f"[IMAGES] Added new image: {image_path} (from turn {i + 1})")
-                else:
-                    # Image already seen from a NEWER turn - skip this older reference
-                    logger.debug(f"[IMAGES] Skipping duplicate image: {image_path} (newer version already included)")
+                seen_images.setdefault(image_path, None)
 
+    image_list = list(seen_images)
     logger.debug(f"[IMAGES] Final image list ({len(image_list)}): {image_list}")
     return image_list
 
 
+def get_conversation_image_list_across_chain(
+    context: ThreadContext, max_depth: int = MAX_THREAD_CHAIN_DEPTH
+) -> list[str]:
+    """
+    Extract unique images from a thread and all of its parent threads, newest first.
+
+    Applies the same newest-first prioritization as get_conversation_image_list(),
+    visiting the given thread first and then walking parent_thread_id links
+    (child -> parent -> grandparent). An image referenced in both a child and a
+    parent thread keeps its position from the child.
+
+    Args:
+        context: ThreadContext to start from (the newest thread in the chain)
+        max_depth: Maximum chain depth to prevent infinite loops
+
+    Returns:
+        list[str]: Unique image paths ordered by newest reference first
+    """
+    if max_depth <= 0:
+        return []
+
+    threads = [context] + _get_ancestors(context, max_depth - 1)
+
+    seen_images: dict[str, None] = {}
+    for thread in threads:
+        for turn in reversed(thread.turns):
+            if turn.images:
+                for image_path in turn.images:
+                    seen_images.setdefault(image_path, None)
+
+    image_list = list(seen_images)
+    logger.debug(f"[IMAGES] Collected {len(image_list)} images across {len(threads)} threads in chain")
+    return image_list
+
+
 def _plan_file_inclusion_by_size(all_files: list[str], max_file_tokens: int) -> tuple[list[str], list[str], int]:
     """
     Plan which files to include based on size constraints.
@@ -81,7 +81,7 @@ class ModelContext:
     def capabilities(self) -> ModelCapabilities:
         """Get model capabilities lazily."""
         if self._capabilities is None:
-            self._capabilities = self.provider.get_capabilities(self.model_name)
+            self._capabilities = ModelProviderRegistry.get_model_capabilities(self.model_name, self.provider)
         return self._capabilities
 
     def calculate_token_allocation(self, reserved_for_response: Optional[int] = None) -> TokenAllocation:
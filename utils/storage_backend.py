@@ -69,6 +69,21 @@ class InMemoryStorage:
                     logger.debug(f"Key {key} expired and removed")
         return None
 
+    def mget(self, keys: list[str]) -> list[Optional[str]]:
+        """Redis-compatible mget: retrieve several values under a single lock acquisition"""
+        values = []
+        now = time.time()
+        with self._lock:
+            for key in keys:
+                entry = self._store.get(key)
+                if entry is not None and now < entry[1]:
+                    values.append(entry[0])
+                else:
+                    if entry is not None:
+                        del self._store[key]
+                    values.append(None)
+        return values
+
     def setex(self, key: str, ttl_seconds: int, value: str) -> None:
         """Redis-compatible setex method"""
         self.set_with_ttl(key, ttl_seconds, value)